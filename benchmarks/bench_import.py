@@ -0,0 +1,62 @@
+""" Benchmark of the cost of `import otpsy`
+
+Each measure is made in a new interpreter, so that no module is
+already loaded. The script reports the wall time of the import and
+checks that the visualisation stack (dash, plotly) is not loaded.
+
+Usage
+-----
+    python benchmarks/bench_import.py --repeat 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["dash", "plotly", "dash_bootstrap_components",
+                 "dash_bootstrap_templates", "otpsy.visualise.app"]
+
+SNIPPET = f"""
+import sys, time, json
+start = time.perf_counter()
+import otpsy
+duration = time.perf_counter() - start
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(json.dumps({{"seconds": duration, "loaded": loaded}}))
+"""
+
+
+def measure_import(repeat: int = 5) -> dict:
+    """ Measure the import time of otpsy in `repeat` fresh interpreters """
+    durations = []
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET],
+            capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        durations.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return {
+        "name": "import otpsy",
+        "repeat": repeat,
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "heavy_modules_loaded": sorted(loaded),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = measure_import(args.repeat)
+    print(json.dumps(result, indent=2))
+    # The visualisation stack must only be loaded by Sample.visualise
+    return 1 if result["heavy_modules_loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
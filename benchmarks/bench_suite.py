@@ -0,0 +1,249 @@
+""" Benchmark suite of otpsy
+
+Every operation (construction of the Sample, each detection method,
+manage, inspect, concat, print and the figure of the dashboard) is
+timed on synthetic dataframes (see generators.py) of several
+distributions and shapes. Results are written as JSON and can be
+compared with a stored baseline to catch regressions.
+
+Presets
+-------
+quick : 1e3 and 1e5 rows, 1 and 10 columns (about a minute).
+full : 1e3 to 1e7 rows, 1 to 5,000 columns, without the shapes of
+    more than 5e7 cells (hours, needs a few GB of memory).
+
+Usage
+-----
+    python benchmarks/bench_suite.py --preset quick --output results.json
+    python benchmarks/bench_suite.py --preset quick --save-baseline
+    python benchmarks/bench_suite.py --preset quick \
+        --baseline benchmarks/baselines/quick.json
+
+With --baseline, a report of the ratios (current / baseline) is
+printed and the script exits with 1 if an operation is slower than
+the baseline by more than the tolerance (default 1.5). Durations
+depend on the machine: a baseline is only comparable with results
+of the same machine (see its "metadata").
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import otpsy as ot
+from generators import DISTRIBUTIONS, make_dataframe
+
+BASELINE_DIRECTORY = os.path.join(os.path.dirname(__file__), "baselines")
+
+PRESETS = {
+    "quick": {
+        "distributions": list(DISTRIBUTIONS),
+        "n_rows": [1_000, 100_000],
+        "n_columns": [1, 10],
+        "max_cells": 1_000_000,
+    },
+    "full": {
+        "distributions": list(DISTRIBUTIONS),
+        "n_rows": [1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+        "n_columns": [1, 10, 100, 1_000, 5_000],
+        "max_cells": 50_000_000,
+    },
+}
+
+# differences below this duration are considered as noise
+NOISE_SECONDS = 5e-4
+
+
+def _sample(df):
+    columns = [column for column in df.columns if column != "participant"]
+    return ot.Sample(df, columns_to_test=columns,
+                     participant_column="participant")
+
+
+def _figure_of_dashboard(sample):
+    try:
+        from otpsy.visualise import app
+    except ImportError:
+        return None
+    columns = sample.columns_to_test[:3]
+    return lambda: app.figure(sample.df, columns, ["IQR", "MAD", "SD", "rSD"],
+                              ["Tukey"], [2, 2.5, 3], "Scatter")
+
+
+def _print(outliers):
+    with contextlib.redirect_stdout(io.StringIO()):
+        print(outliers)
+
+
+def operations(df) -> tuple[dict, ot.Sample]:
+    """ Operations to time on a dataframe, and the sample they use.
+    Each operation is a function without argument (None when it is
+    not available).
+    """
+    sample = _sample(df)
+    sd = sample.method_SD()
+    iqr = sample.method_IQR()
+    return {
+        "Sample": lambda: _sample(df),
+        "method_IQR": sample.method_IQR,
+        "method_SD": sample.method_SD,
+        "method_rSD": sample.method_rSD,
+        "method_MAD": sample.method_MAD,
+        "method_tukey": sample.method_tukey,
+        "method_Sn": sample.method_Sn,
+        "method_prctile": sample.method_prctile,
+        "method_cutoff": sample.method_cutoff,
+        "method_identical": sample.method_identical,
+        "manage_delete": lambda: sd.manage("delete"),
+        "manage_na": lambda: sd.manage("na"),
+        "manage_winsorise": lambda: sd.manage("winsorise"),
+        "inspect": sd.inspect,
+        "concat": lambda: ot.concat([iqr, sd]),
+        "print": lambda: _print(sd),
+        "dashboard": _figure_of_dashboard(sample),
+    }, sample
+
+
+def time_operation(operation, sample, repeat: int) -> dict:
+    """ Minimum and median duration of an operation. The cache of the
+    statistics is cleared before each run, so that every run computes
+    everything. An operation longer than 10 seconds is run once.
+    """
+    durations = []
+    for _ in range(repeat):
+        sample.clear_cache()
+        start = time.perf_counter()
+        operation()
+        durations.append(time.perf_counter() - start)
+        if durations[-1] > 10:
+            break
+    return {"min": min(durations),
+            "median": statistics.median(durations),
+            "repeat": len(durations)}
+
+
+def shapes(preset: dict) -> list:
+    """ (distribution, n_rows, n_columns) of a preset """
+    return [
+        (distribution, n_rows, n_columns)
+        for distribution, n_rows, n_columns in itertools.product(
+            preset["distributions"], preset["n_rows"], preset["n_columns"])
+        if n_rows * n_columns <= preset["max_cells"]
+    ]
+
+
+def run(preset_name: str, repeat: int = 3, only: str = "",
+        verbose: bool = True) -> dict:
+    """ Run the benchmarks of a preset. `only` keeps the operations
+    whose name contains it.
+    """
+    preset = PRESETS[preset_name]
+    results = {}
+    for distribution, n_rows, n_columns in shapes(preset):
+        df = make_dataframe(distribution, n_rows, n_columns)
+        all_operations, sample = operations(df)
+        for name, operation in all_operations.items():
+            if operation is None or only not in name:
+                continue
+            key = f"{name}|{distribution}|{n_rows}x{n_columns}"
+            results[key] = time_operation(operation, sample, repeat)
+            if verbose:
+                print(f"{key:<45} {results[key]['min'] * 1000:10.2f} ms",
+                      file=sys.stderr)
+    return {"metadata": metadata(preset_name, repeat), "results": results}
+
+
+def metadata(preset_name: str, repeat: int) -> dict:
+    return {
+        "preset": preset_name,
+        "repeat": repeat,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 1.5) -> list:
+    """ Rows (key, baseline, current, ratio, status) of the operations
+    present in both results, the slowest ratios first. Status is
+    "regression", "improvement" or "".
+    """
+    rows = []
+    for key, result in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        old = baseline["results"][key]["min"]
+        new = result["min"]
+        ratio = new / old if old > 0 else float("inf")
+        status = ""
+        if abs(new - old) > NOISE_SECONDS:
+            if ratio > tolerance:
+                status = "regression"
+            elif ratio < 1 / tolerance:
+                status = "improvement"
+        rows.append((key, old, new, ratio, status))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows
+
+
+def report(rows: list) -> str:
+    lines = [f"{'operation|distribution|shape':<45} {'baseline':>11} "
+             f"{'current':>11} {'ratio':>7}"]
+    for key, old, new, ratio, status in rows:
+        lines.append(f"{key:<45} {old * 1000:8.2f} ms {new * 1000:8.2f} ms "
+                     f"{ratio:7.2f} {status}")
+    n_regressions = sum(row[4] == "regression" for row in rows)
+    n_improvements = sum(row[4] == "improvement" for row in rows)
+    lines.append(f"\n{len(rows)} operations compared, {n_regressions} "
+                 f"regression(s), {n_improvements} improvement(s).")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", default="",
+                        help="only the operations containing this text")
+    parser.add_argument("--output", help="file to write the results")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the baseline of the preset")
+    parser.add_argument("--baseline", help="baseline to compare with")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args()
+
+    current = run(args.preset, args.repeat, args.only)
+    output = args.output
+    if args.save_baseline:
+        output = os.path.join(BASELINE_DIRECTORY, f"{args.preset}.json")
+    if output:
+        with open(output, "w") as file:
+            json.dump(current, file, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        rows = compare(current, baseline, args.tolerance)
+        print(report(rows))
+        return 1 if any(row[4] == "regression" for row in rows) else 0
+    if not output:
+        print(json.dumps(current, indent=1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+""" Reproducible synthetic data for the benchmarks
+
+Every dataframe has a participant column ("participant", unique
+strings) and `n_columns` tested columns ("col_0", "col_1", ...).
+The same (distribution, n_rows, n_columns, seed) always gives the
+same dataframe.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _normal(rng, shape):
+    return rng.normal(loc=500, scale=100, size=shape)
+
+
+def _skewed(rng, shape):
+    # like reaction times: log-normal with a long right tail
+    return rng.lognormal(mean=6, sigma=0.5, size=shape)
+
+
+def _heavy_tailed(rng, shape):
+    return rng.standard_t(df=2, size=shape) * 50 + 500
+
+
+def _likert(rng, shape):
+    # integers from 1 to 7, with more answers in the middle
+    probabilities = [0.05, 0.1, 0.2, 0.3, 0.2, 0.1, 0.05]
+    return rng.choice(np.arange(1, 8), size=shape, p=probabilities)
+
+
+def _nan_laden(rng, shape):
+    values = rng.normal(loc=500, scale=100, size=shape)
+    values[rng.random(shape) < 0.3] = np.nan
+    return values
+
+
+DISTRIBUTIONS = {
+    "normal": _normal,
+    "skewed": _skewed,
+    "heavy_tailed": _heavy_tailed,
+    "likert": _likert,
+    "nan_laden": _nan_laden,
+}
+
+
+def make_dataframe(
+        distribution: str,
+        n_rows: int,
+        n_columns: int,
+        seed: int = 0
+        ) -> pd.DataFrame:
+    """ Dataframe of n_rows participants and n_columns tested columns
+    drawn from one of DISTRIBUTIONS.
+    """
+    try:
+        draw = DISTRIBUTIONS[distribution]
+    except KeyError as key:
+        raise ValueError(f"Unknown distribution \"{distribution}\", "
+                         f"choose one of {list(DISTRIBUTIONS)}.") from key
+    rng = np.random.default_rng(seed)
+    values = draw(rng, (n_rows, n_columns))
+    df = pd.DataFrame(values,
+                      columns=[f"col_{j}" for j in range(n_columns)])
+    df.insert(0, "participant", [f"P{i}" for i in range(n_rows)])
+    return df
@@ -2,4 +2,6 @@ from otpsy.main import *
 from otpsy.threshold import *
 from otpsy.config import *
 from otpsy.mathematics import *
-from otpsy.additional_function import *
\ No newline at end of file
+from otpsy.additional_function import *
+from otpsy.sketch import QuantileSketch
+from otpsy.profiling import profile
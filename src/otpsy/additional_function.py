@@ -52,27 +52,25 @@ def concat(
     
     Notes
     -----
-    The fundamental concept underlying this function is that concat
-    starts the concatenation process by adding obj1 to obj2.
-    If there are more than two objects to concatenate, the function
-    iteratively incorporates the result obtained from the concatenation
-    and adds the n-th object to this intermediate result. The reason for
-    returning a Multi object is that it deviates from the format of
-    simple main._Outliers subclasses.   
+    The function reads each object once and merges them all in one
+    MethodMulti object: the columns flagged by several objects are
+    merged with a union of their flagged values. Nothing is copied,
+    the new object shares the dataframe of `to_concat[df_to_keep]`.
+    The reason for returning a Multi object is that it deviates from
+    the format of simple main._Outliers subclasses.
     This deviation is particularly notable in the implementation of
     the __str__ method.
     """
-    for i in range(1, len(to_concat)):
-        obj1 = to_concat[0] if i == 1 else new_obj
-        obj2 = to_concat[i]
-
-        new_obj = main.MethodMulti(to_concat[0].df)
-        if issubclass(type(obj1), main._Outliers) and issubclass(type(obj2), main._Outliers):
-            new_obj = utils._concat_both_object(new_obj, obj1, obj2)
-
-        else:
+    if len(to_concat) == 0:
+        raise ValueError("There is no outliers object to concatenate.")
+    for obj in to_concat:
+        if not issubclass(type(obj), main._Outliers):
             raise ValueError("Objects other than outliers are not supported.")
-    return new_obj
+
+    # all the objects are merged at once, with the dataframe to keep
+    # shared (not copied) by the new object
+    new_obj = main.MethodMulti(to_concat[df_to_keep].df)
+    return utils._concat_objects(new_obj, to_concat)
 
 def help_print():
     txt = """\
@@ -0,0 +1,194 @@
+"""Cache of the summary statistics of the tested columns"""
+import weakref
+import numpy as np
+import pandas as pd
+
+# one cache by dataframe, the key is id(df)
+_CACHES = {}
+
+
+def _copy_on_write_enabled() -> bool:
+    """ The cache relies on the copy-on-write of pandas to detect
+    a modification of the dataframe (always enabled since pandas 3.0)
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def _data_pointer(series: pd.Series) -> tuple:
+    """ Address, length and type of the data of a column """
+    values = series.to_numpy()
+    return (values.__array_interface__["data"][0], len(values),
+            values.dtype.str)
+
+
+def summary_statistics(df: pd.DataFrame) -> "SummaryStatistics":
+    """ Cache of the statistics of a dataframe, created at the first
+    call and shared by every object using this dataframe (the sample,
+    its outliers objects and the dashboard).
+    """
+    key = id(df)
+    statistics = _CACHES.get(key)
+    if statistics is None or statistics._df() is not df:
+        statistics = SummaryStatistics(df)
+        _CACHES[key] = statistics
+        # the cache is forgotten with the dataframe
+        weakref.finalize(df, _CACHES.pop, key, None)
+    return statistics
+
+
+class SummaryStatistics:
+    """ ! Private cache of the statistics of the columns of a dataframe !
+
+    For each column, the statistics already computed are kept with a
+    reference to the column. When the dataframe is modified, the
+    copy-on-write of pandas gives new data to the modified columns
+    (the reference keeps the old ones), so the statistics of these
+    columns are computed again. Without copy-on-write (pandas < 3.0
+    without the option), nothing is kept.
+
+    The name of a statistic is "median", "q1", "q3", "mean", "sd",
+    "n_valid", ("mad", b) or ("percentile", p). See
+    threshold._block_statistics.
+
+    When the dataframe comes from a Polars dataframe (see use_polars),
+    the statistics of the columns not modified since are computed
+    by Polars.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = weakref.ref(df)
+        # column -> (reference to the column, its data, statistics)
+        self._columns = {}
+        self._polars = None
+        # column -> its data when the Polars dataframe was given
+        self._polars_pointers = {}
+        # column -> (its data when the sketch was given, sketch)
+        self._sketches = {}
+
+    def __len__(self) -> int:
+        """ Number of columns having statistics in cache """
+        return len(self._columns)
+
+    def use_polars(self, frame, columns_converted: list = ()) -> None:
+        """ Compute the statistics (and the flags) with a Polars
+        dataframe having the same columns as the dataframe.
+
+        Only the columns numeric in Polars are used, the columns
+        converted to numeric by pandas (text, decimal comma...) keep
+        the NumPy computations.
+        """
+        df = self._df()
+        self._polars = frame
+        self._polars_pointers = {
+            column: _data_pointer(df[column])
+            for column, dtype in frame.schema.items()
+            if column in df.columns and dtype.is_numeric()
+            and column not in columns_converted}
+
+    def polars_frame(self, columns: list):
+        """ Polars dataframe of the columns, None if there is no Polars
+        dataframe or if a column was modified since.
+        """
+        if self._polars is None:
+            return None
+        df = self._df()
+        for column in columns:
+            pointer = self._polars_pointers.get(column)
+            if pointer is None or pointer != _data_pointer(df[column]):
+                return None
+        return self._polars.select(columns)
+
+    def use_sketches(self, sketches: dict) -> None:
+        """ Quantile sketches (sketch.QuantileSketch) of the columns,
+        e.g. built chunk by chunk while a file was read, used by the
+        approximate thresholds.
+        """
+        df = self._df()
+        self._sketches = {
+            column: (_data_pointer(df[column]), column_sketch)
+            for column, column_sketch in sketches.items()
+            if column in df.columns}
+
+    def sketches(self, columns: list) -> list | None:
+        """ Sketches of the columns, None if a column has no sketch
+        or was modified since.
+        """
+        df = self._df()
+        sketches = []
+        for column in columns:
+            pointer, column_sketch = self._sketches.get(column, (None, None))
+            if pointer is None or pointer != _data_pointer(df[column]):
+                return None
+            sketches.append(column_sketch)
+        return sketches
+
+    def _statistics_of(self, column) -> dict:
+        series = self._df()[column]
+        pointer = _data_pointer(series)
+        entry = self._columns.get(column)
+        if entry is None or entry[1] != pointer:
+            entry = (series, pointer, {})
+            self._columns[column] = entry
+        return entry[2]
+
+    def get(
+            self,
+            columns: list,
+            names: list,
+            values: np.ndarray | None = None
+            ) -> dict:
+        """ Statistics of several columns
+
+        Parameters
+        ----------
+        columns : list
+            Name of the columns.
+        names : list
+            Name of the statistics.
+        values : np.ndarray, optional
+            Block (rows x columns) of the columns, if it is already
+            extracted.
+
+        Returns
+        -------
+        dict
+            For each statistic, an array with a value by column.
+        """
+        # avoid a circular import, threshold uses the cache
+        from otpsy import threshold
+
+        if not _copy_on_write_enabled():
+            if values is None:
+                values = threshold._numeric_block(self._df(), columns)
+            return threshold._block_statistics(values, names)
+
+        cached = [self._statistics_of(column) for column in columns]
+        missing_names = [name for name in names
+                         if any(name not in stats for stats in cached)]
+        if len(missing_names) > 0:
+            # all the missing statistics are computed in one pass
+            missing_columns = [
+                j for j, stats in enumerate(cached)
+                if any(name not in stats for name in missing_names)]
+            frame = self.polars_frame(
+                [columns[j] for j in missing_columns])
+            if frame is not None:
+                computed = threshold._polars_statistics(frame, missing_names)
+            else:
+                if values is None:
+                    block = threshold._numeric_block(
+                        self._df(), [columns[j] for j in missing_columns])
+                else:
+                    block = values[:, missing_columns]
+                computed = threshold._block_statistics(block, missing_names)
+            for k, j in enumerate(missing_columns):
+                for name in missing_names:
+                    cached[j][name] = computed[name][k]
+        return {name: np.array([stats[name] for stats in cached], dtype=float)
+                for name in names}
+
+    def clear(self) -> None:
+        """ Forget every statistic """
+        self._columns = {}
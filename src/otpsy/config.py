@@ -19,4 +19,23 @@ HEXA_FOR_PLOTLY = {
     "tukey" : "#FEC0CE",
     # "prctile" : "#4B3B40",
     # "cut-off" : "#4B3B40",
-}
\ No newline at end of file
+}
+
+# Maximum number of cells (rows x columns) converted to a NumPy block
+# at once during the detection. Above, columns are flagged by batches.
+MAX_CELLS_BY_BLOCK = 10_000_000
+
+# Above this number of cells (rows x columns), the flagged values of
+# an outliers object are stored bit-packed.
+FLAG_PACKING_THRESHOLD = 50_000_000
+
+# From this number of columns, only the positions of the flagged
+# values of an outliers object are stored (see flags.SparseFlagMatrix),
+# as long as there are few flagged values (see FlagMatrix.compacted).
+FLAG_SPARSE_MIN_COLUMNS = 1_000
+
+# Accuracy parameter k of the quantile sketches used by the approximate
+# thresholds (see sketch.rank_error), and number of values added to a
+# sketch at once.
+SKETCH_K = 200
+SKETCH_BUFFER_SIZE = 65_536
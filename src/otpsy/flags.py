@@ -0,0 +1,381 @@
+"""Storage of the flagged values of an outliers object"""
+import numpy as np
+import pandas as pd
+from otpsy import config
+
+# number of bits set to 1 in each possible byte
+_BIT_COUNT = np.array([bin(byte).count("1") for byte in range(256)],
+                      dtype=np.uint8)
+
+
+class FlagMatrix:
+    """ ! Private storage of the outliers objects !
+
+    Boolean matrix (columns x rows) of the flagged values. Each column
+    of an outliers object (a tested column, "Identical" or
+    "added_manually") is a boolean vector over the rows of the
+    dataframe, True when the value is flagged.
+
+    The matrix is stored in one NumPy array. When it contains more
+    than config.FLAG_PACKING_THRESHOLD cells, each column is
+    bit-packed with np.packbits, which divides the memory by 8.
+    With config.FLAG_SPARSE_MIN_COLUMNS columns or more, only the
+    positions of the flagged values are stored (see SparseFlagMatrix)
+    during the detection. Afterwards, compacted() gives the storage
+    taking less memory, depending on the number of flagged values.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows of the dataframe.
+    columns : list, optional
+        Name of the columns to store. Every value is not flagged
+        at the creation.
+    packed : bool, optional
+        Force (or prevent) the bit-packing. Default depends on the
+        size of the matrix.
+    sparse : bool, optional
+        Force (or prevent) the sparse storage. Default depends on the
+        number of columns.
+    """
+
+    def __new__(
+            cls,
+            n_rows: int = 0,
+            columns: list | None = None,
+            packed: bool | None = None,
+            sparse: bool | None = None
+            ) -> "FlagMatrix":
+        if sparse is None:
+            sparse = columns is not None and \
+                len(columns) >= config.FLAG_SPARSE_MIN_COLUMNS
+        if cls is FlagMatrix and sparse:
+            cls = SparseFlagMatrix
+        return super().__new__(cls)
+
+    def __init__(
+            self,
+            n_rows: int,
+            columns: list | None = None,
+            packed: bool | None = None,
+            sparse: bool | None = None
+            ) -> None:
+        columns = [] if columns is None else list(columns)
+        self.n_rows = n_rows
+        if packed is None:
+            packed = n_rows * max(len(columns), 1) > \
+                config.FLAG_PACKING_THRESHOLD
+        self.packed = packed
+        self.columns = []
+        self._position_of_column = {}
+        self._data = np.zeros((0, self._width), dtype=self._dtype)
+        self.add_columns(columns)
+
+    @property
+    def _width(self) -> int:
+        return (self.n_rows + 7) // 8 if self.packed else self.n_rows
+
+    @property
+    def _dtype(self):
+        return np.uint8 if self.packed else bool
+
+    def __contains__(self, column) -> bool:
+        return column in self._position_of_column
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def _locate(self, column) -> int:
+        try:
+            return self._position_of_column[column]
+        except KeyError as key:
+            raise KeyError(column) from key
+
+    def _pack(self, mask: np.ndarray) -> np.ndarray:
+        """ Transform row masks (rows x columns) in stored columns """
+        mask = np.asarray(mask, dtype=bool)
+        if self.packed:
+            return np.packbits(mask, axis=0).T
+        return mask.T
+
+    def _unpack(self, stored: np.ndarray) -> np.ndarray:
+        """ Transform a stored column in a row mask """
+        if self.packed:
+            return np.unpackbits(stored, count=self.n_rows).view(bool)
+        return stored.copy()
+
+    def add_columns(self, columns: list) -> None:
+        """ Add columns without any flagged value """
+        new_columns = [column for column in dict.fromkeys(columns)
+                       if column not in self]
+        if len(new_columns) == 0:
+            return None
+        for column in new_columns:
+            self._position_of_column[column] = len(self.columns)
+            self.columns.append(column)
+        self._data = np.concatenate([
+            self._data,
+            np.zeros((len(new_columns), self._width), dtype=self._dtype)
+        ])
+        return None
+
+    def set_columns(self, columns: list, mask: np.ndarray) -> None:
+        """ Store the mask (rows x columns) of several columns """
+        self.add_columns(columns)
+        rows = [self._locate(column) for column in columns]
+        self._data[rows] = self._pack(mask)
+
+    def set_column(self, column, mask: np.ndarray) -> None:
+        """ Store the mask of one column """
+        self.set_columns([column], np.asarray(mask).reshape(-1, 1))
+
+    def column(self, column) -> np.ndarray:
+        """ Boolean mask over the rows of one column """
+        return self._unpack(self._data[self._locate(column)])
+
+    def positions(self, column) -> np.ndarray:
+        """ Sorted positions of the flagged rows of one column """
+        return np.flatnonzero(self.column(column))
+
+    def row(self, position: int) -> list:
+        """ Columns in which the row at the given position is flagged """
+        if self.packed:
+            bits = (self._data[:, position // 8] >> (7 - position % 8)) & 1
+        else:
+            bits = self._data[:, position]
+        return [self.columns[k] for k in np.flatnonzero(bits)]
+
+    def flag(self, column, positions) -> None:
+        """ Flag the rows at the given positions of one column """
+        self.add_columns([column])
+        mask = self.column(column)
+        mask[positions] = True
+        self.set_column(column, mask)
+
+    def unflag(self, column, positions) -> None:
+        """ Remove the flag of the rows at the given positions """
+        mask = self.column(column)
+        mask[positions] = False
+        self.set_column(column, mask)
+
+    def unflag_rows(self, mask: np.ndarray, columns: list | None = None) -> None:
+        """ Remove the flag of the rows of a mask, in every column
+        or only in the given columns.
+        """
+        keep = self._pack(~np.asarray(mask, dtype=bool).reshape(-1, 1))[0]
+        if columns is None:
+            self._data &= keep
+        else:
+            rows = [self._locate(column) for column in columns]
+            self._data[rows] &= keep
+
+    def counts(self) -> np.ndarray:
+        """ Number of flagged values of each column """
+        if self.packed:
+            return _BIT_COUNT[self._data].sum(axis=1, dtype=np.int64)
+        return self._data.sum(axis=1)
+
+    def any(self, columns: list | None = None) -> np.ndarray:
+        """ Boolean mask of the rows flagged in at least one column """
+        if columns is None:
+            rows = slice(None)
+        else:
+            rows = [self._locate(column) for column in columns
+                    if column in self]
+        # without column, the reduction gives a vector without flag
+        reduced = np.bitwise_or.reduce(self._data[rows], axis=0)
+        return self._unpack(reduced)
+
+    def take(self, rows: np.ndarray) -> "FlagMatrix":
+        """ New matrix restricted to some rows (mask or positions) """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        new_flags = FlagMatrix(int(mask.sum()), packed=self.packed,
+                               sparse=False)
+        new_flags.add_columns(self.columns)
+        if len(self.columns) > 0:
+            new_flags.set_columns(self.columns, np.column_stack(
+                [self.column(column)[mask] for column in self.columns]))
+        return new_flags
+
+    def to_sparse_frame(self, index=None) -> pd.DataFrame:
+        """ Dataframe (rows x columns) of sparse booleans, only the
+        flagged values being stored.
+        """
+        try:
+            # not a public module of pandas: without it, each column is
+            # built from its boolean mask instead of its positions
+            from pandas._libs.sparse import IntIndex
+        except ImportError:
+            IntIndex = None
+
+        def sparse_column(positions):
+            if IntIndex is None:
+                mask = np.zeros(self.n_rows, dtype=bool)
+                mask[positions] = True
+                return pd.arrays.SparseArray(mask, fill_value=False)
+            return pd.arrays.SparseArray(
+                np.ones(len(positions), dtype=bool),
+                sparse_index=IntIndex(self.n_rows, positions),
+                fill_value=False)
+
+        return pd.DataFrame(
+            {column: sparse_column(positions) for column, positions
+             in zip(self.columns, self._all_positions())},
+            index=index, columns=self.columns)
+
+    def compacted(self) -> "FlagMatrix":
+        """ The same flags in the storage taking less memory. From
+        config.FLAG_SPARSE_MIN_COLUMNS columns, the positions of the
+        flagged values (4 bytes each) are kept only if they take less
+        memory than the boolean matrix (1 bit or 1 byte by cell):
+        with more than 1 flagged value out of 32 (out of 4 without
+        bit-packing), the matrix is smaller.
+        """
+        if len(self.columns) < config.FLAG_SPARSE_MIN_COLUMNS:
+            return self
+        packed = self.n_rows * len(self.columns) > \
+            config.FLAG_PACKING_THRESHOLD
+        matrix_bytes = len(self.columns) * (
+            (self.n_rows + 7) // 8 if packed else self.n_rows)
+        sparse = 4 * int(self.counts().sum()) < matrix_bytes
+        if sparse == isinstance(self, SparseFlagMatrix):
+            return self
+        new_flags = FlagMatrix(self.n_rows, self.columns, packed=packed,
+                               sparse=sparse)
+        for column in self.columns:
+            new_flags.set_column(column, self.column(column))
+        return new_flags
+
+    def _all_positions(self):
+        """ Sorted positions (int32) of the flagged rows of each column """
+        for column in self.columns:
+            yield self.positions(column).astype(np.int32)
+
+
+class SparseFlagMatrix(FlagMatrix):
+    """ ! Private storage of the outliers objects !
+
+    Same as FlagMatrix, for wide data with few flagged values: each
+    column keeps the sorted positions of its flagged rows (compressed
+    sparse columns), so the memory depends on the number of flagged
+    values instead of rows x columns. The columns of each row
+    (compressed sparse rows) are computed when a row is asked, and
+    kept until the next modification.
+    """
+
+    def __init__(
+            self,
+            n_rows: int,
+            columns: list | None = None,
+            packed: bool | None = None,
+            sparse: bool | None = None
+            ) -> None:
+        self.n_rows = n_rows
+        self.packed = False
+        self.columns = []
+        self._position_of_column = {}
+        self._positions = []
+        self._rows = None
+        self.add_columns([] if columns is None else list(columns))
+
+    def _store(self, k: int, positions: np.ndarray) -> None:
+        self._positions[k] = np.asarray(positions, dtype=np.int32)
+        self._rows = None
+
+    def add_columns(self, columns: list) -> None:
+        """ Add columns without any flagged value """
+        for column in dict.fromkeys(columns):
+            if column not in self:
+                self._position_of_column[column] = len(self.columns)
+                self.columns.append(column)
+                self._positions.append(np.zeros(0, dtype=np.int32))
+        return None
+
+    def set_columns(self, columns: list, mask: np.ndarray) -> None:
+        """ Store the mask (rows x columns) of several columns """
+        self.add_columns(columns)
+        mask = np.asarray(mask, dtype=bool)
+        # positions sorted by column, then by row
+        column_of_flag, positions = np.nonzero(mask.T)
+        bounds = np.searchsorted(column_of_flag, np.arange(len(columns) + 1))
+        for j, column in enumerate(columns):
+            self._store(self._locate(column),
+                        positions[bounds[j]:bounds[j + 1]])
+
+    def column(self, column) -> np.ndarray:
+        """ Boolean mask over the rows of one column """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self._positions[self._locate(column)]] = True
+        return mask
+
+    def positions(self, column) -> np.ndarray:
+        """ Sorted positions of the flagged rows of one column """
+        return self._positions[self._locate(column)].astype(np.intp)
+
+    def row(self, position: int) -> list:
+        """ Columns in which the row at the given position is flagged """
+        if self._rows is None:
+            lengths = [len(positions) for positions in self._positions]
+            rows = np.concatenate([np.zeros(0, dtype=np.int32)]
+                                  + self._positions)
+            column_of_flag = np.repeat(np.arange(len(self.columns)), lengths)
+            order = np.argsort(rows, kind="stable")
+            self._rows = (np.searchsorted(rows[order],
+                                          np.arange(self.n_rows + 1)),
+                          column_of_flag[order])
+        bounds, column_of_flag = self._rows
+        return [self.columns[k] for k in
+                column_of_flag[bounds[position]:bounds[position + 1]]]
+
+    def flag(self, column, positions) -> None:
+        """ Flag the rows at the given positions of one column """
+        self.add_columns([column])
+        k = self._locate(column)
+        self._store(k, np.union1d(self._positions[k], positions))
+
+    def unflag(self, column, positions) -> None:
+        """ Remove the flag of the rows at the given positions """
+        k = self._locate(column)
+        self._store(k, np.setdiff1d(self._positions[k], positions))
+
+    def unflag_rows(self, mask: np.ndarray, columns: list | None = None) -> None:
+        """ Remove the flag of the rows of a mask, in every column
+        or only in the given columns.
+        """
+        mask = np.asarray(mask, dtype=bool).reshape(-1)
+        columns = self.columns if columns is None else columns
+        for k in [self._locate(column) for column in columns]:
+            positions = self._positions[k]
+            self._store(k, positions[~mask[positions]])
+
+    def counts(self) -> np.ndarray:
+        """ Number of flagged values of each column """
+        return np.array([len(positions) for positions in self._positions],
+                        dtype=np.int64)
+
+    def any(self, columns: list | None = None) -> np.ndarray:
+        """ Boolean mask of the rows flagged in at least one column """
+        if columns is None:
+            columns = self.columns
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for column in columns:
+            if column in self:
+                mask[self._positions[self._locate(column)]] = True
+        return mask
+
+    def take(self, rows: np.ndarray) -> "SparseFlagMatrix":
+        """ New matrix restricted to some rows (mask or positions) """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        # new position of each kept row
+        new_position = np.cumsum(mask) - 1
+        new_flags = SparseFlagMatrix(int(mask.sum()), self.columns)
+        for k, positions in enumerate(self._positions):
+            new_flags._store(k, new_position[positions[mask[positions]]])
+        return new_flags
+
+    def _all_positions(self):
+        """ Sorted positions (int32) of the flagged rows of each column """
+        return iter(self._positions)
+
@@ -1,10 +1,15 @@
 from otpsy import utils
 from otpsy import config
-from otpsy.visualise import app
+from otpsy import threshold
+from otpsy import flags
+from otpsy import mathematics
+from otpsy import reader
+from otpsy import cache
+from otpsy import parallel
+from otpsy import profiling
 
 import pandas as pd
 import numpy as np
-import copy
 
 class Sample:
     """
@@ -12,10 +17,14 @@ class Sample:
 
     Parameters
     ----------
-    df : pd.DataFrame, pd.Series, list, np.array
+    df : pd.DataFrame, pd.Series, list, np.array, pl.DataFrame, pl.LazyFrame
         The input DataFrame to be processed. If you want to only test
-        a series, you can enter a pd.Series. Other type of dataframe
-        is still not supported.
+        a series, you can enter a pd.Series. A 1-D or 2-D np.array
+        (or np.memmap) is used without copy: the detection runs on
+        its values. With a Polars dataframe (eager or lazy), only the
+        columns to test and the participant column are taken, and the
+        thresholds of IQR, SD, MAD, Tukey and percentile are computed
+        by Polars. Other type of dataframe is still not supported.
 
     columns_to_test : str, list, int, or pd.Series, optional
         Columns to test corresponds to all columns you want
@@ -42,6 +51,10 @@ class Sample:
         string. If participant_column equals to an empty string
         (default), the initial index of the dataframe will be keep.
 
+    column_names : list[str], optional
+        Name of the columns of an array or a list. Default is "Tested"
+        for one column, "Tested_0", "Tested_1"... otherwise.
+
     **kwargs
         Additional keyword arguments.
 
@@ -89,13 +102,18 @@ class Sample:
             data: pd.DataFrame|pd.Series|np.ndarray|list,
             columns_to_test: str | list[str] | int | list[int] | pd.Series = "",
             participant_column: str | int | pd.Series = "",
+            column_names: list[str] | None = None,
             **kwargs
         ) -> None:
 
         self.columns_to_test = columns_to_test
         self.participant_column = participant_column
+        # the columns read from Arrow or Polars are read-only: as long as
+        # the frame they come from is kept, pandas copies a column the
+        # first time it is modified (copy-on-write) instead of failing
+        self._source = data
         if self.participant_column == "":
-            self.df = data
+            self.df = data.copy(deep=False)
         else:
             self.df = data.set_index(self.participant_column)
 
@@ -103,7 +121,235 @@ class Sample:
             self.missing = kwargs["missing"]
         else:
             self.missing = "No additional missing values"
+
+        # statistics and flags computed by Polars (see cache.py)
+        if "polars" in kwargs:
+            cache.summary_statistics(self.df).use_polars(
+                kwargs["polars"],
+                getattr(self.missing, "columns_converted", []))
     
+    @classmethod
+    def from_csv(
+            cls,
+            filepath,
+            columns_to_test: str | list[str] | int | list[int] = "all",
+            participant_column: str | int = "",
+            chunksize: int = 100_000,
+            approximate: bool = False,
+            **kwargs
+        ) -> "Sample":
+        """ ## Create a sample from a csv file
+        The file is read by chunks and only the columns to test and
+        the participant column are parsed. Each chunk is converted to
+        numeric when it is read, and copied in columns allocated once
+        (a first pass counts the rows). Thus, a file bigger than the
+        memory can be used as long as the tested columns fit in
+        memory: the peak memory is the tested columns plus one chunk.
+
+        Parameters
+        ----------
+        filepath : str or path
+            Path of the csv file.
+        columns_to_test : str, int or list, optional
+            Columns to test (name or position). Default is all the
+            columns except the participant column.
+        participant_column : str or int, optional
+            Column refering to participants. Default is an empty
+            string (the index is the row number).
+        chunksize : int, optional
+            Number of rows read at once. Default is 100 000.
+        approximate : bool, optional
+            Build a quantile sketch (see ot.QuantileSketch) of each
+            column chunk by chunk, while the file is read. The methods
+            called with approximate=True then take their quantiles
+            from these sketches, without another pass on the values
+            (except the MAD, which needs the distances to the median).
+            Default is False.
+        **kwargs
+            Keyword arguments of pd.read_csv (e.g. sep=";").
+
+        Returns
+        -------
+        Sample
+            The sample, as if created with ot.Sample.
+
+        Examples
+        --------
+        ```python
+        >>> sample = ot.Sample.from_csv("data.csv", ["A", "B"],
+        participant_column="ID", sep=";", approximate=True)
+        >>> outliers = sample.method_IQR(approximate=True)
+        ```
+        """
+        data, columns_to_test, participant_column, missing, sketches = \
+            reader.read_csv(filepath, columns_to_test, participant_column,
+                            chunksize, approximate, **kwargs)
+        sample = cls(data, columns_to_test, participant_column)
+        sample.missing = missing
+        if sketches is not None:
+            cache.summary_statistics(sample.df).use_sketches(sketches)
+        return sample
+
+    @classmethod
+    def from_parquet(
+            cls,
+            source,
+            columns_to_test: str | list[str] | int | list[int] = "all",
+            participant_column: str | int = "",
+            memory_map: bool = True,
+            **kwargs
+        ) -> "Sample":
+        """ ## Create a sample from a Parquet file
+        Only the columns to test and the participant column are read
+        from the file. Numeric columns are kept as they are, only text
+        columns are converted to numeric. Needs pyarrow.
+
+        Parameters
+        ----------
+        source : str, path or file-like object
+            The Parquet file.
+        columns_to_test : str, int or list, optional
+            Columns to test (name or position). Default is all the
+            columns except the participant column.
+        participant_column : str or int, optional
+            Column refering to participants. Default is an empty
+            string (the index is the row number).
+        memory_map : bool, optional
+            Memory-map the file instead of reading it. Default is True.
+        **kwargs
+            Keyword arguments of pyarrow.parquet.read_table.
+
+        Returns
+        -------
+        Sample
+            The sample, as if created with ot.Sample.
+
+        Examples
+        --------
+        ```python
+        >>> sample = ot.Sample.from_parquet("data.parquet", ["A", "B"],
+        participant_column="ID")
+        ```
+        """
+        data, columns_to_test, participant_column = reader.read_parquet(
+            source, columns_to_test, participant_column, memory_map,
+            **kwargs)
+        return cls(data, columns_to_test, participant_column)
+
+    @classmethod
+    def from_arrow(
+            cls,
+            source,
+            columns_to_test: str | list[str] | int | list[int] = "all",
+            participant_column: str | int = ""
+        ) -> "Sample":
+        """ ## Create a sample from an Arrow table
+        Only the columns to test and the participant column are
+        converted to pandas, and the numeric columns without missing
+        values are not copied. Needs pyarrow.
+
+        Parameters
+        ----------
+        source : pyarrow.Table, pyarrow.RecordBatch, str or path
+            The table, or the path of an Arrow IPC (Feather) file,
+            which is memory-mapped.
+        columns_to_test : str, int or list, optional
+            Columns to test (name or position). Default is all the
+            columns except the participant column.
+        participant_column : str or int, optional
+            Column refering to participants. Default is an empty
+            string (the index is the row number).
+
+        Returns
+        -------
+        Sample
+            The sample, as if created with ot.Sample.
+        """
+        data, columns_to_test, participant_column = reader.read_arrow(
+            source, columns_to_test, participant_column)
+        return cls(data, columns_to_test, participant_column)
+
+    def statistics(self, b: float = 1.4826) -> pd.DataFrame:
+        """ ## Summary statistics of the columns to test
+        The statistics are kept in a cache shared by the sample, its
+        outliers objects and the dashboard, so the methods
+        (IQR, SD, MAD, Tukey, percentile) do not compute them again.
+        When the dataframe is modified, the statistics of the modified
+        columns are computed again (it relies on the copy-on-write of
+        pandas, always enabled since pandas 3.0).
+
+        Parameters
+        ----------
+        b : float, optional
+            Constant of the MAD. Default equals 1.4826.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row by column to test with n_valid, mean, sd, median,
+            q1, q3 and mad.
+        """
+        names = ["n_valid", "mean", "sd", "median", "q1", "q3", ("mad", b)]
+        summary = cache.summary_statistics(self.df).get(
+            self.columns_to_test, names)
+        summary["mad"] = summary.pop(("mad", b))
+        summary = pd.DataFrame(summary, index=self.columns_to_test)
+        summary["n_valid"] = summary["n_valid"].astype(int)
+        return summary
+
+    def clear_cache(self) -> None:
+        """ Forget the statistics kept in cache (see statistics) """
+        cache.summary_statistics(self.df).clear()
+
+    def sweep(
+            self,
+            distances: list | dict,
+            methods: list[str] = ("iqr", "sd", "mad", "tukey"),
+            threshold_included: bool = False,
+            b: float = 1.4826,
+            return_index: bool = False
+        ) -> pd.DataFrame:
+        """ ## Sensitivity analysis of the distance
+        Number of flagged values of each column, for each method and
+        each distance. The statistics of each method are computed once
+        by column and each column is sorted once, so many distances
+        cost almost nothing more than one.
+
+        Parameters
+        ----------
+        distances : list or dict
+            Distances to test with every method, or a dictionnary
+            {method: distances} (the percentile method needs distances
+            between 50 and 100).
+        methods : list, optional
+            Shortname of the methods among "iqr", "sd", "mad", "tukey",
+            "prctile" and "sn". Default is iqr, sd, mad and tukey.
+        threshold_included : bool, optional
+            Specifies whether the detection threshold is inclusive.
+            Default is False.
+        b : float, optional
+            Constant of the MAD method. Default equals 1.4826.
+        return_index : bool, optional
+            If True, the index of the flagged values are given in a
+            column "flagged". Default is False.
+
+        Returns
+        -------
+        pd.DataFrame
+            Tidy dataframe with one row by column, method and distance
+            (column, method, distance, low_threshold, high_threshold,
+            n_flagged).
+
+        Examples
+        --------
+        ```python
+        >>> sample.sweep(np.arange(2, 4.25, 0.25), methods=["sd", "mad"])
+        ```
+        """
+        return threshold.sweep_distances(
+            self.df, self.columns_to_test, distances, methods,
+            threshold_included, b, return_index)
+
     def visualise(
             self, 
             column: str | list[str] | int | list[int] = "",
@@ -118,6 +364,9 @@ class Sample:
             Column(s) that you want to visualise.
             Default is all columns.
         """
+        # dash and plotly are only loaded when the dashboard is needed
+        from otpsy.visualise import app
+
         if column == "":
             column_to_vis = self.columns_to_test
         else:
@@ -130,7 +379,9 @@ class Sample:
     def method_IQR(
         self, 
         distance: float = 2,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        approximate : bool = False,
+        by : str | list[str] | None = None
         ):
         """ ## Interquartile Range
         Method to create an outliers object via the **IQR-based** 
@@ -147,6 +398,19 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        approximate : bool, optional
+            If True, quantiles are approximated with mergeable quantile
+            sketches (see ot.QuantileSketch), with a rank error of
+            about 1.3%. It is only useful with a sample created by
+            ot.Sample.from_csv(..., approximate=True), whose sketches
+            were built while the file was read: otherwise the
+            sketches are built from the values in memory, which adds
+            an error without saving memory. Default is False (exact
+            quantiles).
+        by : str or list, optional
+            Column(s) (or index level) defining groups, e.g. the
+            condition or the site. The thresholds are then computed
+            within each group. Default is None (no group).
 
         Return
         -------
@@ -158,14 +422,17 @@ class Sample:
             self.columns_to_test,
             self.participant_column,
             distance,
-            threshold_included
+            threshold_included,
+            approximate,
+            by=by
         )
 
     @utils._check_number_entry
     def method_SD(
         self, 
         distance: float = 2.5,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        by : str | list[str] | None = None
         ):
         """## Standard Deviation
         Method to create an outliers object via the **SD-based** 
@@ -182,6 +449,10 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        by : str or list, optional
+            Column(s) (or index level) defining groups, e.g. the
+            condition or the site. The thresholds are then computed
+            within each group. Default is None (no group).
 
         Return
         ------
@@ -193,7 +464,8 @@ class Sample:
             self.columns_to_test,
             self.participant_column,
             distance,
-            threshold_included
+            threshold_included,
+            by=by
         )
 
     @utils._check_number_entry
@@ -201,7 +473,9 @@ class Sample:
         self, 
         distance: float = 3, 
         iteration: int = 3,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        n_jobs : int = 1,
+        executor : str = "thread"
         ):
         """ ## Recursive Standard Deviation
         Method to create an outliers object via the rSD-based outlier
@@ -225,6 +499,14 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        n_jobs : int, optional
+            Number of columns tested at the same time, -1 for one by
+            processor. Results are the same as with n_jobs=1.
+            Default is 1.
+        executor : str or concurrent.futures.Executor, optional
+            "thread" (the computations release the GIL) or "process"
+            (the values are shared with the processes without copy),
+            or an executor already created. Default is "thread".
 
         Return
         -------
@@ -237,7 +519,9 @@ class Sample:
             self.participant_column,
             distance,
             iteration,
-            threshold_included
+            threshold_included,
+            n_jobs=n_jobs,
+            executor=executor
         )
 
     @utils._check_number_entry
@@ -245,7 +529,9 @@ class Sample:
         self, 
         distance: float = 3, 
         b: float = 1.4826,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        approximate : bool = False,
+        by : str | list[str] | None = None
         ):
         """ ## Median Absolute Deviation
         Method to create an outliers object via the Median Absolute
@@ -269,6 +555,19 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        approximate : bool, optional
+            If True, quantiles are approximated with mergeable quantile
+            sketches (see ot.QuantileSketch), with a rank error of
+            about 1.3%. It is only useful with a sample created by
+            ot.Sample.from_csv(..., approximate=True), whose sketches
+            were built while the file was read: otherwise the
+            sketches are built from the values in memory, which adds
+            an error without saving memory. Default is False (exact
+            quantiles).
+        by : str or list, optional
+            Column(s) (or index level) defining groups, e.g. the
+            condition or the site. The thresholds are then computed
+            within each group. Default is None (no group).
 
         Return
         -------
@@ -281,14 +580,18 @@ class Sample:
             self.participant_column,
             distance,
             b,
-            threshold_included
+            threshold_included,
+            approximate,
+            by=by
         )
 
     @utils._check_number_entry
     def method_tukey(
         self, 
         distance: float = 1.5,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        approximate : bool = False,
+        by : str | list[str] | None = None
         ):
         """ ## Tukey
         Method to create an outliers object via the Tukey-based outlier
@@ -306,6 +609,19 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        approximate : bool, optional
+            If True, quantiles are approximated with mergeable quantile
+            sketches (see ot.QuantileSketch), with a rank error of
+            about 1.3%. It is only useful with a sample created by
+            ot.Sample.from_csv(..., approximate=True), whose sketches
+            were built while the file was read: otherwise the
+            sketches are built from the values in memory, which adds
+            an error without saving memory. Default is False (exact
+            quantiles).
+        by : str or list, optional
+            Column(s) (or index level) defining groups, e.g. the
+            condition or the site. The thresholds are then computed
+            within each group. Default is None (no group).
 
 
         Return
@@ -318,14 +634,18 @@ class Sample:
             self.columns_to_test,
             self.participant_column,
             distance,
-            threshold_included
+            threshold_included,
+            approximate,
+            by=by
         )
 
     @utils._check_number_entry
     def method_Sn(
         self, 
         distance: float = 3,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        n_jobs : int = 1,
+        executor : str = "thread"
         ):
         """ ## Sn method
         Method to create an outliers object via the Sn outlier
@@ -349,6 +669,14 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        n_jobs : int, optional
+            Number of columns tested at the same time, -1 for one by
+            processor. Results are the same as with n_jobs=1.
+            Default is 1.
+        executor : str or concurrent.futures.Executor, optional
+            "thread" (the computations release the GIL) or "process"
+            (the values are shared with the processes without copy),
+            or an executor already created. Default is "thread".
 
         Return
         ------
@@ -360,14 +688,18 @@ class Sample:
             self.columns_to_test,
             self.participant_column,
             distance,
-            threshold_included
+            threshold_included,
+            n_jobs=n_jobs,
+            executor=executor
         )
 
     @utils._check_number_entry
     def method_prctile(
         self, 
         distance: float = 98,
-        threshold_included : bool = False
+        threshold_included : bool = False,
+        approximate : bool = False,
+        by : str | list[str] | None = None
         ):
         """ ## Percentile method
         Method to create an outliers object via the percentile method
@@ -386,6 +718,19 @@ class Sample:
             Specifies whether the detection threshold is inclusive. 
             If True, the detection is inclusive (>= or <=), 
             if False, it is exclusive (> or <). Default is False.
+        approximate : bool, optional
+            If True, quantiles are approximated with mergeable quantile
+            sketches (see ot.QuantileSketch), with a rank error of
+            about 1.3%. It is only useful with a sample created by
+            ot.Sample.from_csv(..., approximate=True), whose sketches
+            were built while the file was read: otherwise the
+            sketches are built from the values in memory, which adds
+            an error without saving memory. Default is False (exact
+            quantiles).
+        by : str or list, optional
+            Column(s) (or index level) defining groups, e.g. the
+            condition or the site. The thresholds are then computed
+            within each group. Default is None (no group).
 
         Return
         ------
@@ -397,7 +742,9 @@ class Sample:
             self.columns_to_test,
             self.participant_column,
             distance,
-            threshold_included
+            threshold_included,
+            approximate,
+            by=by
         )
 
     @utils._check_number_entry
@@ -500,6 +847,12 @@ class _Outliers:
     The Outliers class contains all the common method of the children classes.
     Children classes are all outliers class (SD, IQR,...).
     """
+    # only the methods based on quantiles can be approximated
+    approximate = False
+    # columns defining the groups of the grouped detection
+    by = None
+    # measures of the stages, with profile=True (see profiling.profile)
+    timings = None
 
     def __str__(self) -> str:
         """
@@ -537,15 +890,99 @@ class _Outliers:
             output_text += utils._content_add_false(self)
         return output_text[0:-2]
 
+    @property
+    @profiling.profiled("dict_col")
+    def dict_col(self) -> dict:
+        """
+        Dictionnary having for each column the list of the index
+        of the flagged participants. It is derived from the boolean
+        matrix of flagged values. The participants are in the order
+        of the rows, except the ones added manually which are sorted
+        by index, as when they were stored in a list.
+        """
+        index = self.df.index
+        dict_col = {column: index[self._flags.column(column)].tolist()
+                    for column in self._flags.columns}
+        if "added_manually" in dict_col:
+            dict_col["added_manually"].sort()
+        return dict_col
+
+    @dict_col.setter
+    def dict_col(self, value: dict) -> None:
+        new_flags = flags.FlagMatrix(len(self.df.index), list(value))
+        for column, index_to_find in value.items():
+            new_flags.flag(column, utils._get_position(
+                self.df, index_to_find))
+        self._flags = new_flags.compacted()
+
+    @property
+    def nb(self) -> dict:
+        """ Dictionnary having for each column the number of
+        flagged values.
+        """
+        return dict(zip(self._flags.columns,
+                        self._flags.counts().tolist()))
+
+    @property
+    def position(self) -> dict:
+        """ Dictionnary having for each column the sorted position
+        (row number) of the flagged values.
+        """
+        return {column: self._flags.positions(column).tolist()
+                for column in self._flags.columns}
+
+    @property
+    @profiling.profiled("all_index")
+    def all_index(self) -> list:
+        """ Sorted list of all participants having at least one
+        flagged value.
+        """
+        index_to_select = set(
+            self.df.index[self._flags.any()].tolist())
+        return sorted(index_to_select)
+
+    def flagged_columns(self, participant) -> list:
+        """ ## Columns in which a participant is flagged
+
+        Parameters
+        ----------
+        participant : str or int
+            Index of the participant.
+
+        Returns
+        -------
+        list
+            The columns (or "Identical", "added_manually") in which
+            the participant is flagged.
+        """
+        columns = []
+        for position in utils._get_position(self.df, participant):
+            columns.extend(self._flags.row(position))
+        return list(dict.fromkeys(columns))
+
+    def sparse_flags(self) -> pd.DataFrame:
+        """ ## Flagged values as a sparse dataframe
+        Dataframe (participants x columns) of sparse booleans, True
+        when the value is flagged. Only the flagged values are stored,
+        which suits data with many columns and few outliers.
+
+        Returns
+        -------
+        pd.DataFrame
+            Columns of type pd.SparseDtype(bool, False).
+        """
+        return self._flags.to_sparse_frame(self.df.index)
+
     def _calculate(
             self, 
             method
             ) -> None :
         """
         Private method used to calculate outliers.
-        It iterates through the columns,
+        It takes all the columns to test as one block,
         calculates threshold values using the chosen method, 
-        identifies outliers, and stores relevant information 
+        identifies outliers with a single comparison on the block,
+        and stores relevant information 
         such as the list of outliers, threshold values, and 
         their positions in the dataframe for each column
         The results are stored in instance attributes
@@ -567,39 +1004,96 @@ class _Outliers:
         None
             The method modifies the object in place and updates relevant parameters.
         """
-        # get the function for calculate threshold
-        func = config.DICT_FUNCTION.get(method)
-        for column in self.columns_to_test:
-            # Calculate threshold
+        self._flags = flags.FlagMatrix(
+            len(self.df.index), self.columns_to_test)
+        if self.by is not None:
+            return self._calculate_by_group(method)
+        for batch in utils._column_batches(self.df, self.columns_to_test):
+            # 2-D block (rows x columns) of the columns of the batch
+            with profiling.stage("numeric_block"):
+                values = threshold._numeric_block(self.df, batch)
+
+            # Calculate thresholds of all columns at once
             # for the MAD method, a "b" can be given
-            if method == "mad":
-                low_threshold, high_threshold = func(
-                    self.df, [column], self.distance, self.b)
-            else:
-                low_threshold, high_threshold = func(
-                    self.df, [column], self.distance)
-
-            # list of outliers by column
-            if self.threshold_included == False:
-                list_outliers = self.df.index[
-                    ((self.df[column] < low_threshold) |
-                    (self.df[column] > high_threshold))
-                ].tolist()
-            else:
-                list_outliers = self.df.index[
-                    ((self.df[column] <= low_threshold) |
-                    (self.df[column] >= high_threshold))
-                ].tolist()
-            self.dict_col[column] = list_outliers
-            self.threshold[column] = (low_threshold, high_threshold)
-            self.nb[column] = len(list_outliers)
-            self.position[column] = utils._get_position(
-                self.df, self.dict_col[column])
-
-        self.all_index = utils._select_index(
-            self.dict_col.keys(), self.dict_col)
+            # quantiles can be approximated by sketches (the ones built
+            # while the file was read, see Sample.from_csv), otherwise
+            # the statistics already computed on this dataframe are
+            # reused
+            b = self.b if method == "mad" else 1.4826
+            with profiling.stage("threshold"):
+                if self.approximate:
+                    low_threshold, high_threshold = \
+                        threshold._approximate_block(
+                            values, method, self.distance, b,
+                            cache.summary_statistics(self.df).sketches(batch))
+                else:
+                    low_threshold, high_threshold = \
+                        threshold._cached_thresholds(
+                            self.df, batch, method, self.distance, b, values)
+
+            # flag every column in one comparison
+            with profiling.stage("mask"):
+                polars_frame = cache.summary_statistics(
+                    self.df).polars_frame(batch)
+                if polars_frame is not None:
+                    flagged = threshold._polars_flags(
+                        polars_frame, low_threshold, high_threshold,
+                        self.threshold_included)
+                elif self.threshold_included == False:
+                    flagged = (values < low_threshold) | \
+                        (values > high_threshold)
+                else:
+                    flagged = (values <= low_threshold) | \
+                        (values >= high_threshold)
+                self._flags.set_columns(batch, flagged)
+            for j, column in enumerate(batch):
+                self.threshold[column] = (low_threshold[j], high_threshold[j])
+        self._flags = self._flags.compacted()
         return(0)
 
+    def _calculate_by_group(self, method) -> None:
+        """
+        Private method used to calculate outliers within groups.
+        The thresholds of every group are computed with groupby
+        reductions, and each value is compared to the thresholds of
+        its group. For each column, the threshold is a tuple of two
+        pd.Series (low, high) indexed by the groups.
+        """
+        if self.approximate:
+            raise ValueError("Approximate thresholds are not available "
+                             "with groups.")
+        for column in self.by:
+            if column in self.columns_to_test:
+                raise ValueError("A column used to define groups can't be "
+                                 "in the columns you want to test")
+        codes, groups = utils._group_codes(self.df, self.by)
+        b = self.b if method == "mad" else 1.4826
+        for batch in utils._column_batches(self.df, self.columns_to_test):
+            with profiling.stage("numeric_block"):
+                values = threshold._numeric_block(self.df, batch)
+            with profiling.stage("threshold"):
+                low_threshold, high_threshold = \
+                    threshold._grouped_block_thresholds(
+                        values, codes, method, self.distance, b)
+
+            # thresholds of the group of each row (NaN without group)
+            with profiling.stage("mask"):
+                no_group = np.full((1, len(batch)), np.nan)
+                low_by_row = np.vstack([low_threshold, no_group])[codes]
+                high_by_row = np.vstack([high_threshold, no_group])[codes]
+                if self.threshold_included == False:
+                    flagged = (values < low_by_row) | (values > high_by_row)
+                else:
+                    flagged = (values <= low_by_row) | \
+                        (values >= high_by_row)
+                self._flags.set_columns(batch, flagged)
+            for j, column in enumerate(batch):
+                self.threshold[column] = (
+                    pd.Series(low_threshold[:, j], index=groups, name="low"),
+                    pd.Series(high_threshold[:, j], index=groups, name="high"))
+        self._flags = self._flags.compacted()
+        return None
+
     def add(
             self, 
             to_add : str | list[str]
@@ -668,19 +1162,10 @@ class _Outliers:
         if isinstance(to_add, (list)):
             # if there is already a column added_manually coming from
             # a past addition, it extends it. If not, it create a new
-            # key that have the value []. 
-            # The comprehension list is to avoid redundancy
-            self.dict_col.setdefault("added_manually", []).extend(
-                list(set([elem for elem in to_add 
-                 if elem not in self.dict_col["added_manually"]])))
-            self.dict_col["added_manually"].sort()
-
-            # Update other parameters
-            self.nb["added_manually"] = len(self.dict_col["added_manually"])
-            self.position["added_manually"] = utils._get_position(
-                self.df, self.dict_col["added_manually"])
-            self.all_index = utils._select_index(
-                self.dict_col.keys(), self.dict_col)
+            # column. Flagging twice the same participant changes
+            # nothing, which avoids redundancy.
+            self._flags.flag("added_manually", utils._get_position(
+                self.df, to_add))
         
         elif issubclass(type(to_add), _Outliers):
             raise KeyError('You can\'t add an outlier object'
@@ -741,33 +1226,28 @@ class _Outliers:
 
         Note: The method modifies the object in place and updates relevant parameters.
         """
-        out = {} # same as to_remove, but formatted
+        index = self.df.index.astype(str)
         try:
             # User inputed 
             # Out_obj.sub(["participant1", "participant2"])
-            if isinstance(to_remove, list):
-                for column in self.dict_col:
-                    out[column] = [value for value in to_remove]
             # If there is just one participant index 
             # User inputed : Out_obj.sub("participant1")
-            elif isinstance(to_remove, (int, str)):
-                for column in self.dict_col:
-                    out[column] = [to_remove]
+            if isinstance(to_remove, (list, int, str)):
+                if isinstance(to_remove, (int, str)):
+                    to_remove = [to_remove]
+                # one mask of the rows to remove, applied on every column
+                self._flags.unflag_rows(
+                    index.isin([str(value) for value in to_remove]))
             elif isinstance(to_remove, (dict)):
-                out = to_remove
-                # transform to a list for allow iteration if user input :
-                # Out_obj.sub({"first_column": "participant1"})
-                if isinstance(out[column], (int, str)):
-                    out[column] = [out[column]]
-            
-            for column in out:
-                out[column] = [str(value) for value in out[column]]
-                self.dict_col[column] = [value for value in 
-                                            self.dict_col[column]
-                                            if str(value) not 
-                                            in out[column]]
-
-
+                for column, value in to_remove.items():
+                    # transform to a list for allow iteration if user input :
+                    # Out_obj.sub({"first_column": "participant1"})
+                    if isinstance(value, (int, str)):
+                        value = [value]
+                    self._flags.unflag_rows(
+                        index.isin([str(elem) for elem in value]), [column])
+            else:
+                raise TypeError
 
         except KeyError as key:
             raise KeyError(f'It seems that the column "{column}"'
@@ -777,21 +1257,15 @@ class _Outliers:
             raise TypeError("This type of value is not "
                             "supported.") from type
 
-        # Update parameters needed
-        for column in self.dict_col:
-            self.nb[column] = len(self.dict_col[column])
-            self.position[column] = utils._get_position(
-                self.df, self.dict_col[column])
-        self.all_index = utils._select_index(
-            self.dict_col.keys(), self.dict_col)
-
         return None
     
+    @profiling.profiled("manage")
     def manage(
             self, 
             method: str = "delete" ,
-            column: str | int | list[str] | list[int] = 'all'
-            ) -> pd.DataFrame:
+            column: str | int | list[str] | list[int] = 'all',
+            inplace: bool = False
+            ) -> pd.DataFrame | None:
         """
         Manage outliers in the dataframe using specified method.
 
@@ -814,66 +1288,107 @@ class _Outliers:
             method only on them. Default value take into account
             all columns.
 
+        inplace : bool, optional
+            If True, the attribute "df" of the object is replaced by
+            the managed dataframe and None is returned. With "delete",
+            the flagged values of the deleted rows are forgotten.
+            The dataframe of the sample is never modified.
+            Default is False.
+
         Returns
         -------
-        pd.DataFrame
+        pd.DataFrame or None
             A new dataframe with outliers managed based on the specified 
-            method.
+            method, or None if inplace is True.
 
         Raises
         ------
         ValueError
             Winsorisation is not possible with "Sn" and "Identical" methods.
+
+        Notes
+        -----
+        The object is not copied. With "na" and "winsorise", only the
+        managed columns are new: the other columns are shared with the
+        dataframe of the object, thanks to the copy-on-write of pandas
+        (always enabled since pandas 3.0, enabled locally before).
         """
         # ignore the format input for the column
         column = utils._process_column_to_test(self.df, column)
-        
-        # to allow modification of the dataframe without changing the
-        # attribute "df" of the object, a new dataframe is created
-        obj1 = copy.deepcopy(self)
-        new_df = obj1.df
-        column_to_delete = [col for col in self.dict_col if col in column]
+        column_to_manage = [col for col in self._flags.columns
+                            if col in column]
+
         if method == "delete":
-            if 'added_manually' in self.dict_col:
-                column_to_delete.append("added_manually")
-            index_to_delete_clean = utils._select_index(
-                column_to_delete, self.dict_col)
-            final_df = new_df.drop(index_to_delete_clean)
+            if 'added_manually' in self._flags:
+                column_to_manage.append("added_manually")
+            to_delete = self._flags.any(column_to_manage)
+            final_df = self.df.drop(self.df.index[to_delete])
+            if inplace:
+                self._flags = self._flags.take(~to_delete)
 
         elif method == "na":
-            if 'added_manually' in self.dict_col:
+            if 'added_manually' in self._flags:
                 print("Warning: Participant added manually can't be managed "
                       "by \"na\" method.")
             if self.shortname == "id":
-                # In the dict_col of Identical, there is only one column
+                # In the flags of Identical, there is only one column
                 # "Identical", but this column is not in the column of
                 # the dataframe.
-                column_to_delete = [col for col in self.columns_to_test 
-                                    if col in column]
-                for column in column_to_delete:
-                    new_df.loc[self.dict_col["Identical"], column] = np.nan
+                mask = {col: self._flags.column("Identical")
+                        for col in self.columns_to_test if col in column}
             else:
-                for column in column_to_delete:
-                    new_df.loc[self.dict_col[column], column] = np.nan
-            
-            final_df = new_df
+                # columns without flagged values are not read
+                nb = self.nb
+                mask = {col: self._flags.column(col)
+                        for col in column_to_manage if nb[col] > 0}
+            mask = {col: value for col, value in mask.items() if value.any()}
+            with utils._copy_on_write():
+                final_df = self.df.copy(deep=False)
+                for col, value in mask.items():
+                    final_df[col] = utils._mask_values(self.df[col], value)
 
         elif method == "winsorise":
             if self.method == "Sn" or self.method == "Identical":
                 raise ValueError('No winsorisation is '
                                  f'possible with the "{self.method}" method')
-            if 'added_manually' in self.dict_col:
+            if 'added_manually' in self._flags:
                 print("Warning: Participant added manually can't be managed.")
-            for column in column_to_delete:
-                low_threshold, high_threshold = self.threshold[column]
-                new_df.loc[new_df[column] < low_threshold,
-                            column] = low_threshold
-                new_df.loc[new_df[column] > high_threshold,
-                           column] = high_threshold
-            final_df = new_df
-
+            column_to_manage = [col for col in column_to_manage
+                                if col in self.threshold]
+            low_threshold = pd.Series(
+                {col: self.threshold[col][0] for col in column_to_manage},
+                dtype=float)
+            high_threshold = pd.Series(
+                {col: self.threshold[col][1] for col in column_to_manage},
+                dtype=float)
+            if self.by is not None:
+                # threshold of the group of each row
+                codes, _ = utils._group_codes(self.df, self.by)
+                low_threshold = pd.DataFrame(
+                    {col: utils._threshold_by_row(self.threshold[col][0], codes)
+                     for col in column_to_manage}, index=self.df.index)
+                high_threshold = pd.DataFrame(
+                    {col: utils._threshold_by_row(self.threshold[col][1], codes)
+                     for col in column_to_manage}, index=self.df.index)
+            with utils._copy_on_write():
+                final_df = self.df.copy(deep=False)
+                if len(column_to_manage) > 0 and self.by is not None:
+                    final_df[column_to_manage] = \
+                        self.df[column_to_manage].clip(
+                            lower=low_threshold, upper=high_threshold)
+                elif len(column_to_manage) > 0:
+                    # all the columns are clipped in one operation
+                    final_df[column_to_manage] = \
+                        self.df[column_to_manage].clip(
+                            lower=low_threshold, upper=high_threshold,
+                            axis=1)
+
+        if inplace:
+            self.df = final_df
+            return None
         return final_df
 
+    @profiling.profiled("inspect")
     def inspect(
             self,
             aberrant_format: str = "value",
@@ -975,26 +1490,48 @@ class _Outliers:
         | P5       |  ..  |  ..  |  ..  |
         ```
         """
-        table = pd.DataFrame(index=self.df.index)
-        # the iteration on df.columns and not on keys of self.outliers
-        # is present to conserve the order of columns in the initial
-        # dataframe
-        for column in self.df.columns:
-            if column in self.dict_col:
-                temporary_series = self.df[[column]].apply(
-                    utils._parameters_of_the_table,
-                    args=(aberrant_format, other_value, self.dict_col, column),
-                    axis=1)
-                df_to_append = pd.DataFrame(temporary_series, columns=[column])
-                table = table.join(df_to_append)
+        # columns having flagged values. For the identical method,
+        # the flag concerns every column tested.
+        if self.shortname == "id":
+            mask_of_column = {column: "Identical"
+                              for column in self.columns_to_test}
+        else:
+            mask_of_column = {column: column for column in self._flags.columns
+                              if column in self.df.columns}
+
+        # Rows are selected before building the table
+        if all_participants:
+            rows = np.arange(len(self.df.index))
+        else:
+            rows = np.flatnonzero(self._flags.any())
+
+        if all_columns:
+            # conserve the order of columns in the initial dataframe
+            columns = list(self.df.columns)
+        else:
+            columns = list(mask_of_column)
+
+        table = {}
+        for column in columns:
+            values = self.df[column].array[rows]
+            if column not in mask_of_column:
+                table[column] = values
+                continue
+            mask = self._flags.column(mask_of_column[column])
+            # cells keep the value (if aberrant_format or other_value
+            # is "value") or become a boolean. The type of the column
+            # depends on all participants, even if they are not shown.
+            keep_value = np.where(mask, aberrant_format == "value",
+                                  other_value == "value")
+            if keep_value.all():
+                table[column] = values
+            elif not keep_value.any():
+                table[column] = mask[rows]
             else:
-                table[column] = self.df[column]
-        if not all_participants:
-            table = table.loc[table.index.isin(
-                self.all_index)]
-        if not all_columns:
-            table = table[self.dict_col.keys()]
-        return table
+                table[column] = np.where(keep_value[rows],
+                                         np.asarray(values, dtype=object),
+                                         mask[rows])
+        return pd.DataFrame(table, index=self.df.index[rows], columns=columns)
         
 
 class MethodIqr(_Outliers):
@@ -1005,6 +1542,8 @@ class MethodIqr(_Outliers):
         participant_column: str | int | pd.Series,
         distance: int | float,
         threshold_included : bool,
+        approximate : bool = False,
+        by : str | list[str] | None = None,
     ) -> None:
 
         self.df = df
@@ -1012,13 +1551,12 @@ class MethodIqr(_Outliers):
         self.participant_column = participant_column
         self.distance = distance
         self.threshold_included = threshold_included
+        self.by = None if by is None else utils._process_by(df, by)
+        self.approximate = approximate
         self.method = "Inter-quartile range"
         self.shortname = "iqr"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
         self._calculate(self.shortname)
 
@@ -1031,6 +1569,7 @@ class MethodSd(_Outliers):
         participant_column: str | int | pd.Series,
         distance: int | float,
         threshold_included : bool,
+        by : str | list[str] | None = None,
     ) -> None:
 
         self.df = df
@@ -1038,13 +1577,11 @@ class MethodSd(_Outliers):
         self.participant_column = participant_column
         self.distance = distance
         self.threshold_included = threshold_included
+        self.by = None if by is None else utils._process_by(df, by)
         self.method = "Standard Deviation"
         self.shortname = "sd"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
         self._calculate(self.shortname)
 
@@ -1058,6 +1595,8 @@ class MethodRSd(_Outliers):
         distance: int | float,
         max_iteration: int,
         threshold_included : bool,
+        n_jobs : int = 1,
+        executor : str = "thread",
     ) -> None:
 
         self.df = df
@@ -1068,58 +1607,33 @@ class MethodRSd(_Outliers):
         self.threshold_included = threshold_included
         self.method = "Recursive Standard Deviation"
         self.shortname = "rsd"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index), columns_to_test)
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
-        self._calculate(self.shortname)
-
-    def _calculate(self, method):
-        func = config.DICT_FUNCTION.get(method)
-        obj1 = copy.deepcopy(self)
-        for column in self.columns_to_test:
-
-            df_to_operate_n = pd.DataFrame()
-            df_to_operate_n_plus_1 = obj1.df
-            self.iteration = 0
-
-            while len(df_to_operate_n.index) \
-                != len(df_to_operate_n_plus_1.index) \
-                    and self.iteration < self.max_iteration:
+        # the executor is not kept (the object needs to be copyable)
+        self._calculate(self.shortname, n_jobs, executor)
 
-                df_to_operate_n = df_to_operate_n_plus_1
+    def _calculate(self, method, n_jobs=1, executor="thread"):
+        """ Private method used to calculate outliers.
 
-                # Calculate threshold
-                low_threshold, high_threshold = func(
-                    df_to_operate_n, [column], self.distance)
-                # list of outliers by column
-                if self.threshold_included == False:
-                    list_outliers = self.df.index[ # CHECK IF NO MISTAKE DUE TO THE USE OF DF AND NOT DF_TO_OPERATE
-                        ((self.df[column] < low_threshold) |
-                        (self.df[column] > high_threshold))
-                    ].tolist()
-                else:
-                    list_outliers = self.df.index[
-                        ((self.df[column] <= low_threshold) |
-                        (self.df[column] >= high_threshold))
-                    ].tolist()       
-
-                self.dict_col[column] = list_outliers
-
-                df_to_operate_n_plus_1 = df_to_operate_n.drop(
-                    labels=list_outliers,
-                    axis=0,
-                    errors="ignore"
-                )
-                self.iteration += 1
+        Each column is trimmed recursively on its own sorted values
+        (see mathematics.recursive_sd), without copying the dataframe.
+        The columns can be trimmed at the same time (see
+        parallel.map_columns).
+        """
+        with profiling.stage("threshold"):
+            results = parallel.map_columns(
+                mathematics.recursive_sd,
+                self.df,
+                self.columns_to_test,
+                (self.distance, self.max_iteration, self.threshold_included),
+                n_jobs,
+                executor)
+        for column, result in zip(self.columns_to_test, results):
+            low_threshold, high_threshold, flagged, self.iteration = result
             self.threshold[column] = (low_threshold, high_threshold)
-            self.nb[column] = len(list_outliers)
-            self.position[column] = utils._get_position(
-                self.df, self.dict_col[column])
-        self.all_index = utils._select_index(
-            self.dict_col.keys(), self.dict_col)
+            self._flags.set_column(column, flagged)
+        self._flags = self._flags.compacted()
 
 
 class MethodMad(_Outliers):
@@ -1131,6 +1645,8 @@ class MethodMad(_Outliers):
         distance: int | float,
         b: int | float,
         threshold_included : bool,
+        approximate : bool = False,
+        by : str | list[str] | None = None,
     ) -> None:
 
         self.df = df
@@ -1139,13 +1655,12 @@ class MethodMad(_Outliers):
         self.distance = distance
         self.b = b
         self.threshold_included = threshold_included
+        self.by = None if by is None else utils._process_by(df, by)
+        self.approximate = approximate
         self.method = "Median Absolute Distance"
         self.shortname = "mad"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
         self._calculate(self.shortname)
 
@@ -1158,6 +1673,8 @@ class MethodTukey(_Outliers):
         participant_column: str | int | pd.Series,
         distance: int | float,
         threshold_included : bool,
+        approximate : bool = False,
+        by : str | list[str] | None = None,
     ) -> None:
 
         self.df = df
@@ -1165,13 +1682,12 @@ class MethodTukey(_Outliers):
         self.participant_column = participant_column
         self.distance = distance
         self.threshold_included = threshold_included
+        self.by = None if by is None else utils._process_by(df, by)
+        self.approximate = approximate
         self.method = "Tukey"
         self.shortname = "tukey"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
         self._calculate(self.shortname)
 
@@ -1184,6 +1700,8 @@ class MethodSn(_Outliers):
         participant_column: str | int | pd.Series,
         distance: int | float,
         threshold_included : bool,
+        n_jobs : int = 1,
+        executor : str = "thread",
     ) -> None:
 
         self.df = df
@@ -1193,41 +1711,36 @@ class MethodSn(_Outliers):
         self.threshold_included = threshold_included
         self.method = "Sn"
         self.shortname = "sn"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index), columns_to_test)
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
-        self._calculate(self.shortname)
-
-    def _calculate(self, method):
-        func = config.DICT_FUNCTION.get(method)
-        for column in self.columns_to_test:
-            # Calculate threshold
-            threshold, all_distance = func(
-                self.df, [column], self.distance)
+        # the executor is not kept (the object needs to be copyable)
+        self._calculate(self.shortname, n_jobs, executor)
+
+    def _calculate(self, method, n_jobs=1, executor="thread"):
+        # the median distances of the columns can be computed at the
+        # same time (see parallel.map_columns)
+        with profiling.stage("threshold"):
+            results = parallel.map_columns(
+                mathematics.S_n_values,
+                self.df,
+                self.columns_to_test,
+                n_jobs=n_jobs,
+                executor=executor)
+        for column, (Sn, all_distance) in zip(self.columns_to_test, results):
+            threshold = Sn * self.distance
             # list of outliers by column
             # Contrary to the parent calculate method,
             # the identification is realised on the all_distance
             # which contains every median distance to other point
-            if self.threshold_included == False:
-                list_outliers = all_distance.index[
-                    all_distance > threshold
-                ].tolist()
-            else:
-                list_outliers = all_distance.index[
-                    all_distance >= threshold
-                ].tolist()
-
-            self.dict_col[column] = list_outliers
+            with profiling.stage("mask", column):
+                if self.threshold_included == False:
+                    flagged = all_distance > threshold
+                else:
+                    flagged = all_distance >= threshold
+                self._flags.set_column(column, flagged)
             self.threshold[column] = threshold
-            self.nb[column] = len(list_outliers)
-            self.position[column] = utils._get_position(
-                self.df, self.dict_col[column])
-
-        self.all_index = utils._select_index(
-            self.dict_col.keys(), self.dict_col)
+        self._flags = self._flags.compacted()
 
 
 class MethodPrctile(_Outliers):
@@ -1238,6 +1751,8 @@ class MethodPrctile(_Outliers):
         participant_column: str | int | pd.Series,
         distance: int | float,
         threshold_included : bool,
+        approximate : bool = False,
+        by : str | list[str] | None = None,
     ) -> None:
 
         self.df = df
@@ -1245,13 +1760,12 @@ class MethodPrctile(_Outliers):
         self.participant_column = participant_column
         self.distance = distance
         self.threshold_included = threshold_included
+        self.by = None if by is None else utils._process_by(df, by)
+        self.approximate = approximate
         self.method = "Percentile"
         self.shortname = "prctile"
-        self.all_index = []
-        self.dict_col = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.threshold = {}
-        self.nb = {}
-        self.position = {}
         self.multi = False
         self._calculate(self.shortname)
 
@@ -1274,10 +1788,7 @@ class MethodCutOff(_Outliers):
         self.threshold_included = threshold_included
         self.method = "Cut-Off"
         self.shortname = "cut-off"
-        self.all_index = []
-        self.dict_col = {}
-        self.nb = {}
-        self.position = {}
+        self._flags = flags.FlagMatrix(len(df.index), columns_to_test)
         self.multi = False
         self._calculate()
 
@@ -1295,24 +1806,21 @@ class MethodCutOff(_Outliers):
                 self.distance[1] = self.df[column].max() +1
             self.threshold[column] = (self.distance[0], self.distance[1])
             # list of outliers by column
-            if self.threshold_included == False:
-                list_outliers = self.df.index[
-                    (self.df[column] < self.threshold[column][0])|
-                    (self.df[column] > self.threshold[column][1])
-                ].tolist()
-            else:
-                list_outliers = self.df.index[
-                    (self.df[column] <= self.threshold[column][0])|
-                    (self.df[column] >= self.threshold[column][1])
-                ].tolist()
+            with profiling.stage("mask", column):
+                if self.threshold_included == False:
+                    flagged = (
+                        (self.df[column] < self.threshold[column][0])|
+                        (self.df[column] > self.threshold[column][1])
+                    ).to_numpy()
+                else:
+                    flagged = (
+                        (self.df[column] <= self.threshold[column][0])|
+                        (self.df[column] >= self.threshold[column][1])
+                    ).to_numpy()
 
-            # update parameters       
-            self.dict_col[column] = list_outliers
-            self.nb[column] = len(list_outliers)
-            self.position[column] = utils._get_position(
-                self.df, self.dict_col[column])
-        self.all_index = utils._select_index(
-            self.dict_col.keys(), self.dict_col)
+                # update parameters       
+                self._flags.set_column(column, flagged)
+        self._flags = self._flags.compacted()
 
 
 class MethodIdentical(_Outliers):
@@ -1335,37 +1843,26 @@ class MethodIdentical(_Outliers):
         self.threshold_included = threshold_included
         self.method = "Identical"
         self.shortname = "id"
-        self.all_index = []
-        self.dict_col = {}
-        self.nb = {}
-        self.position = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.multi = False
         self._calculate("identical")
 
     def _calculate(self, method):
         """ Private method used to calculate outliers """
-        self.all_index = []
-        self.dict_col = {}
-        self.nb = {}
+        self._flags = flags.FlagMatrix(len(self.df.index))
         # get the function for calculate threshold
         func = config.DICT_FUNCTION.get(method)
         # Calculate threshold
-        max_frequency = func(
-            self.df, self.columns_to_test)
+        with profiling.stage("threshold"):
+            max_frequency = func(
+                self.df, self.columns_to_test)
         # list of outliers by column
-        if self.threshold_included == False:
-            list_outliers = self.df.index[
-                (max_frequency > self.frequency)
-            ].tolist()
-        else:
-            list_outliers = self.df.index[
-                (max_frequency >= self.frequency)
-            ].tolist()
-        self.dict_col["Identical"] = list_outliers
-        self.nb["Identical"] = len(list_outliers)
-        self.all_index = list_outliers
-        self.position["Identical"] = utils._get_position(
-            self.df, self.dict_col["Identical"], self.shortname)
+        with profiling.stage("mask"):
+            if self.threshold_included == False:
+                flagged = (max_frequency > self.frequency).to_numpy()
+            else:
+                flagged = (max_frequency >= self.frequency).to_numpy()
+            self._flags.set_column("Identical", flagged)
 
     def __str__(self):
         # I used this to avoid overiding columns to test at this 
@@ -1387,11 +1884,10 @@ class MethodMulti(_Outliers):
         self.df = df
         self.method = []
         self.distance = {}
-        self.nb = {}
         self.threshold = {}
         self.columns_to_test = []
         self.columns_to_test_w_method = {}
-        self.position = {}
+        self._flags = flags.FlagMatrix(len(df.index))
         self.multi = True
         self.shortname = []
         
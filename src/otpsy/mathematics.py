@@ -1,5 +1,7 @@
 """Module used for computation"""
+import warnings
 import numpy as np
+import pandas as pd
 
 # Median Absolute Distance
 
@@ -15,6 +17,222 @@ def compute_mad(df, column, median, b) -> float:
     mad = np.nanmedian(distance_to_median)
     return mad*b
 
+
+def compute_mad_block(values, median, b) -> np.ndarray:
+    """Compute Median absolute distance of every column of a 2-D block
+    
+    Same as compute_mad, but for a block (rows x columns) of values
+    and the median of each column.
+    """
+    distance_to_median = np.abs(values - median)
+    mad = nanmedian_block(distance_to_median)
+    return mad*b
+
+# Quantiles of a block with missing values
+# np.nanquantile and np.nanmedian compute the columns one by one
+# (np.apply_along_axis). Here, the block is sorted once (missing values
+# at the end) and the quantiles are read at the positions given by the
+# number of values of each column.
+
+
+def sorted_block(values) -> tuple[np.ndarray, np.ndarray] | None:
+    """ Block sorted along the rows and number of values by column
+
+    None when the block has no missing value (np.quantile and
+    np.median are then used directly).
+    """
+    missing = np.isnan(values)
+    if not missing.any():
+        return None
+    return np.sort(values, axis=0), len(values) - missing.sum(axis=0)
+
+
+def nanquantile_block(values, q, sorted_values=False) -> np.ndarray:
+    """ Same as np.nanquantile(values, q, axis=0) (linear method),
+    with a single sort of the 2-D block. NaN for a column without value.
+
+    sorted_values is the result of sorted_block(values), to share the
+    sort between several statistics of the same block.
+    """
+    q = np.asarray(q, dtype=float)
+    if sorted_values is False:
+        sorted_values = sorted_block(values)
+    if sorted_values is None:
+        return np.quantile(values, q, axis=0)
+    sorted_values, n_valid = sorted_values
+    columns = np.arange(values.shape[1])
+    result = []
+    for quantile in q.ravel():
+        # same index and interpolation as np.quantile
+        virtual = (n_valid - 1) * quantile
+        previous = np.floor(virtual).astype(np.intp)
+        following = previous + 1
+        above = virtual >= n_valid - 1
+        previous[above] = following[above] = n_valid[above] - 1
+        below = virtual < 0
+        previous[below] = following[below] = 0
+        gamma = virtual - previous
+        low = sorted_values[previous, columns]
+        high = sorted_values[following, columns]
+        difference = high - low
+        interpolated = np.where(gamma >= 0.5,
+                                high - difference * (1 - gamma),
+                                low + difference * gamma)
+        interpolated[n_valid == 0] = np.nan
+        result.append(interpolated)
+    return np.array(result).reshape(q.shape + (values.shape[1],))
+
+
+def nanmedian_block(values, sorted_values=False) -> np.ndarray:
+    """ Same as np.nanmedian(values, axis=0), with a single sort of
+    the 2-D block. NaN for a column without value.
+    """
+    if sorted_values is False:
+        sorted_values = sorted_block(values)
+    if sorted_values is None:
+        return np.median(values, axis=0)
+    sorted_values, n_valid = sorted_values
+    columns = np.arange(values.shape[1])
+    middle = n_valid // 2
+    high = sorted_values[np.minimum(middle, len(values) - 1), columns]
+    low = sorted_values[np.maximum(middle - 1, 0), columns]
+    median = np.where(n_valid % 2 == 1, high, (low + high) / 2)
+    median[n_valid == 0] = np.nan
+    return median
+
+# Recursive standard deviation
+
+
+def recursive_sd(values, distance, max_iteration, threshold_included=False):
+    """ Compute the recursive standard deviation thresholds
+
+    At each iteration, thresholds are computed as the mean plus or
+    minus distance standard deviations of the values that are still
+    kept. Values outside the thresholds are flagged (among all values)
+    and removed, until no value is removed or max_iteration is reached.
+
+    The values are sorted once. Since the kept values are always a
+    contiguous slice of the sorted values, the mean and the standard
+    deviation of each iteration are obtained in O(1) from prefix sums,
+    and the flagged values from two binary searches. The values are
+    centered before the prefix sums to limit rounding errors.
+
+    Returns
+    -------
+    low_threshold, high_threshold, flagged, iteration
+        The thresholds of the last iteration, the boolean mask of the
+        flagged values and the number of iterations done.
+    """
+    values = np.asarray(values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(values))
+    order = valid[np.argsort(values[valid], kind="stable")]
+    sorted_values = values[order]
+    n = len(sorted_values)
+
+    shift = sorted_values.mean() if n > 0 else 0
+    centered = sorted_values - shift
+    sum_prefix = np.concatenate([[0], np.cumsum(centered)])
+    square_prefix = np.concatenate([[0], np.cumsum(centered ** 2)])
+
+    # kept values are sorted_values[start:stop]
+    start, stop = 0, n
+    low_index, high_index = 0, n
+    low_threshold = high_threshold = np.nan
+    iteration = 0
+    while iteration < max_iteration:
+        count = stop - start
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = (sum_prefix[stop] - sum_prefix[start]) / count
+            variance = (square_prefix[stop] - square_prefix[start]) / count \
+                - mean ** 2
+        sd = np.sqrt(max(variance, 0)) if count > 0 else np.nan
+        low_threshold = np.round(shift + mean - distance * sd, 3)
+        high_threshold = np.round(shift + mean + distance * sd, 3)
+
+        # values flagged are sorted_values[:low_index] and
+        # sorted_values[high_index:]
+        if np.isnan(low_threshold) or np.isnan(high_threshold):
+            low_index, high_index = 0, n
+        elif threshold_included:
+            low_index = np.searchsorted(sorted_values, low_threshold, "right")
+            high_index = np.searchsorted(sorted_values, high_threshold, "left")
+        else:
+            low_index = np.searchsorted(sorted_values, low_threshold, "left")
+            high_index = np.searchsorted(sorted_values, high_threshold, "right")
+        iteration += 1
+
+        new_start = max(start, low_index)
+        new_stop = max(min(stop, high_index), new_start)
+        if new_stop - new_start == count:
+            # no new value removed
+            break
+        start, stop = new_start, new_stop
+
+    flagged = np.zeros(values.shape, dtype=bool)
+    flagged[order[:low_index]] = True
+    flagged[order[max(high_index, low_index):]] = True
+    return low_threshold, high_threshold, flagged, iteration
+
+
+# Identical
+
+
+def max_frequency(values) -> np.ndarray:
+    """ Compute the frequency of the most frequent value of each row
+
+    For each row of a 2-D block (rows x columns), this function gives
+    the number of times the most frequent value appears. Missing
+    values are not counted, and a row only composed of missing values
+    gets a missing value.
+    When the values are small integers (e.g. Likert scales), the
+    values are counted with one offset np.bincount. Otherwise, each
+    row is sorted and the length of the runs of identical values is
+    computed.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind not in "biuf":
+        # non-numeric values are replaced by integer codes
+        codes, _ = pd.factorize(values.ravel())
+        values = codes.reshape(values.shape).astype(float)
+        values[values < 0] = np.nan
+    values = values.astype(float)
+    n_rows, n_cols = values.shape
+    missing = np.isnan(values)
+    frequency = np.zeros(n_rows)
+    if values.size == 0:
+        return np.full(n_rows, np.nan)
+
+    valid_values = values[~missing]
+    if valid_values.size > 0:
+        low, high = valid_values.min(), valid_values.max()
+        n_bins = high - low + 2  # last bin is used for missing values
+        small_integers = np.all(valid_values == np.round(valid_values)) \
+            and n_bins * n_rows <= max(4 * values.size, 1_000_000)
+    else:
+        small_integers = False
+
+    if small_integers:
+        n_bins = int(n_bins)
+        codes = np.where(missing, n_bins - 1, values - low).astype(np.int64)
+        codes += np.arange(n_rows)[:, np.newaxis] * n_bins
+        counts = np.bincount(codes.ravel(), minlength=n_rows * n_bins)
+        frequency = counts.reshape(n_rows, n_bins)[:, :-1].max(axis=1)
+    elif valid_values.size > 0:
+        # missing values are sorted at the end of each row
+        sorted_values = np.sort(values, axis=1)
+        new_run = np.ones(sorted_values.shape, dtype=bool)
+        new_run[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+        run_id = np.cumsum(new_run.ravel()) - 1
+        # each missing value is its own run, which is not counted
+        length_of_run = np.bincount(
+            run_id, weights=~np.isnan(sorted_values.ravel()))
+        first_run_of_row = run_id[::n_cols]
+        frequency = np.maximum.reduceat(length_of_run, first_run_of_row)
+
+    frequency = frequency.astype(float)
+    frequency[missing.all(axis=1)] = np.nan
+    return frequency
+
 # Sn
 
 
@@ -34,10 +252,100 @@ def _select_c(n):
     return c
 
 
+def _median_distances(values) -> np.ndarray:
+    """ Private function
+
+    For each value, compute the median of its absolute distance to
+    every other non-missing value. Missing values get a missing
+    median distance.
+
+    The values are sorted once. For a given point, the distances to
+    the points on its left and on its right are then two sorted
+    sequences, so the k-th smallest distance is found with a binary
+    search on the number of points taken on the left (Croux &
+    Rousseeuw, 1992). The search is run for every point at the same
+    time, which gives an O(n log n) computation instead of O(n²).
+    """
+    values = np.asarray(values, dtype=float)
+    all_median = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values)
+    order = np.argsort(values[valid], kind="stable")
+    y = values[valid][order]
+    n = len(y)
+    # number of distances for each point
+    m = n - 1
+    if m < 1:
+        return all_median
+
+    i = np.arange(n)
+    # rank of the (lower) median distance
+    k = (m + 1) // 2
+
+    def left(t):
+        # distance to the t-th point on the left (t >= 1)
+        return y[i] - y[np.clip(i - t, 0, n - 1)]
+
+    def right(t):
+        # distance to the t-th point on the right (t >= 1)
+        return y[np.clip(i + t, 0, n - 1)] - y[i]
+
+    # a corresponds to the number of distances taken on the left
+    low = np.maximum(0, k - (n - 1 - i))
+    high = np.minimum(i, k)
+    while np.any(low < high):
+        mid = (low + high) // 2
+        go_left = left(mid + 1) >= right(k - mid)
+        searching = low < high
+        high = np.where(searching & go_left, mid, high)
+        low = np.where(searching & ~go_left, mid + 1, low)
+
+    a = low
+    b = k - a
+    kth = np.maximum(np.where(a > 0, left(a), -np.inf),
+                     np.where(b > 0, right(b), -np.inf))
+    if m % 2 == 0:
+        # even number of distances: mean of the two middle distances
+        next_kth = np.minimum(
+            np.where(a + 1 <= i, left(a + 1), np.inf),
+            np.where(b + 1 <= n - 1 - i, right(b + 1), np.inf))
+        kth = (kth + next_kth) / 2
+
+    sorted_median = np.empty(n)
+    sorted_median[order] = kth
+    all_median[valid] = sorted_median
+    return all_median
+
+
 def S_n(df, column):
     """ Compute Sn on Python
     
     This function aim to compute the Sn value. This value is obtained
+    by multiplying the median of the median distances to other points
+    by c and 1.1926.
+    It returns the Sn value and the median distance of each participant
+    to the other ones. See S_n_reference for the quadratic version.
+    """
+    Sn, all_median = S_n_values(df[column].to_numpy(dtype=float))
+    return Sn, pd.Series(all_median, index=df.index)
+
+
+def S_n_values(values):
+    """ Same as S_n, on the array of the values of a column """
+    c = _select_c(len(values))
+    all_median = _median_distances(values)
+    with warnings.catch_warnings():
+        # column only composed of missing values
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        Sn = np.nanmedian(all_median) * c * 1.1926
+    return Sn, all_median
+
+
+def S_n_reference(df, column):
+    """ Compute Sn on Python (reference implementation)
+    
+    Quadratic computation of Sn, kept as a reference for S_n.
+    For each participant, the median distance to every other point
+    is computed row by row.
     """
     n = len(df[column])
     c = _select_c(n)
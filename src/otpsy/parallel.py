@@ -0,0 +1,126 @@
+"""Execution of a detection on several columns at the same time"""
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from otpsy import utils
+
+
+def _n_workers(n_jobs: int) -> int:
+    """ Number of workers, -1 meaning one by processor """
+    if n_jobs == -1:
+        return os.cpu_count() or 1
+    if not isinstance(n_jobs, (int, np.integer)) or isinstance(n_jobs, bool) \
+            or n_jobs < 1:
+        raise ValueError("n_jobs needs to be a positive integer or -1.")
+    return int(n_jobs)
+
+
+def _column_in_shared_memory(name, shape, j, function, args):
+    """ Worker of a process: apply the function on the column j of the
+    block stored in the shared memory called name.
+    """
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        block = np.ndarray(shape, dtype=float, buffer=memory.buf, order="F")
+        result = function(block[:, j], *args)
+        # the view needs to be released before closing the memory
+        del block
+    finally:
+        memory.close()
+    return result
+
+
+def _map_threads(function, block, args, pool):
+    return list(pool.map(lambda j: function(block[:, j], *args),
+                         range(block.shape[1])))
+
+
+def _map_processes(function, block, args, pool):
+    # the block is written once in a shared memory, each process
+    # reads its column there instead of receiving a copy
+    memory = shared_memory.SharedMemory(create=True,
+                                        size=max(block.nbytes, 1))
+    try:
+        shared = np.ndarray(block.shape, dtype=float,
+                            buffer=memory.buf, order="F")
+        shared[:] = block
+        del shared
+        futures = [pool.submit(_column_in_shared_memory, memory.name,
+                               block.shape, j, function, args)
+                   for j in range(block.shape[1])]
+        return [future.result() for future in futures]
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def map_columns(
+        function,
+        df,
+        columns: list,
+        args: tuple = (),
+        n_jobs: int = 1,
+        executor: str | Executor = "thread"
+        ) -> list:
+    """ Apply function(values, *args) on the values (float array)
+    of each column.
+
+    Parameters
+    ----------
+    function : callable
+        Function of the values of one column. With processes, it needs
+        to be defined at the top of a module (to be pickled).
+    df : pd.DataFrame
+        The dataframe.
+    columns : list
+        Name of the columns.
+    args : tuple, optional
+        Other arguments of the function.
+    n_jobs : int, optional
+        Number of workers, -1 for one by processor. Default is 1
+        (no parallelism).
+    executor : str or concurrent.futures.Executor, optional
+        "thread" or "process", or an executor already created (n_jobs
+        is then ignored). Default is "thread".
+
+    Returns
+    -------
+    list
+        The results, in the order of the columns.
+    """
+    if isinstance(executor, str):
+        if executor not in ("thread", "process"):
+            raise ValueError("executor needs to be \"thread\", \"process\" "
+                             "or a concurrent.futures.Executor.")
+        n_workers = _n_workers(n_jobs)
+    elif isinstance(executor, Executor):
+        n_workers = None
+    else:
+        raise TypeError(f"The type of data {type(executor)} "
+                        "is not supported as executor.")
+
+    if n_workers == 1 or len(columns) <= 1:
+        return [function(df[column].to_numpy(dtype=float), *args)
+                for column in columns]
+
+    if isinstance(executor, str):
+        pool_class = ThreadPoolExecutor if executor == "thread" \
+            else ProcessPoolExecutor
+        pool = pool_class(max_workers=min(n_workers, len(columns)))
+    else:
+        pool = executor
+    map_block = _map_processes if isinstance(pool, ProcessPoolExecutor) \
+        else _map_threads
+
+    results = []
+    try:
+        # the columns are converted by batches to bound the memory
+        for batch in utils._column_batches(df, columns):
+            block = np.asfortranarray(
+                df[list(batch)].to_numpy(dtype=float))
+            results.extend(map_block(function, block, args, pool))
+    finally:
+        if pool is not executor:
+            pool.shutdown()
+    return results
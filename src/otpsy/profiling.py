@@ -0,0 +1,138 @@
+"""Opt-in measure of the time and the memory of each stage of a detection"""
+import contextvars
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+import pandas as pd
+
+# measures of the running profile, None when the profiling is disabled.
+# A context variable: a profile only measures the stages run in its
+# thread (the workers of parallel.map_columns are not measured).
+_ACTIVE = contextvars.ContextVar("profile", default=None)
+_NO_STAGE = nullcontext()
+
+
+class Timings:
+    """ Measures of the stages run during a profile (see profile)
+
+    For each stage (and each column, when the stage is run column by
+    column), it keeps the number of calls, the wall time and the peak
+    of memory allocated during the stage (with tracemalloc). The time
+    and the memory of a stage include the stages run inside it.
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        # (stage, column) -> [calls, seconds, peak memory]
+        self.records = {}
+        # memory at the start and peak of each running stage
+        self._running = []
+
+    @contextmanager
+    def _stage(self, name: str, column=None):
+        record = self.records.setdefault((name, column), [0, 0.0, 0])
+        if self.memory:
+            if self._running:
+                self._running[-1][1] = max(self._running[-1][1],
+                                           tracemalloc.get_traced_memory()[1])
+                tracemalloc.reset_peak()
+            self._running.append([tracemalloc.get_traced_memory()[0], 0])
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = 0
+            if self.memory:
+                start_memory, running_peak = self._running.pop()
+                running_peak = max(running_peak,
+                                   tracemalloc.get_traced_memory()[1])
+                peak = max(running_peak - start_memory, 0)
+                if self._running:
+                    self._running[-1][1] = max(self._running[-1][1],
+                                               running_peak)
+                    tracemalloc.reset_peak()
+            record[0] += 1
+            record[1] += seconds
+            record[2] = max(record[2], peak)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """ One row by stage and column, in the order of the first call.
+        The column is missing for a stage run on all the columns.
+        """
+        return pd.DataFrame(
+            [(name, column, calls, seconds, peak)
+             for (name, column), (calls, seconds, peak)
+             in self.records.items()],
+            columns=["stage", "column", "calls", "seconds",
+                     "peak_memory_bytes"])
+
+    def __repr__(self) -> str:
+        return self.to_dataframe().to_string(index=False)
+
+
+@contextmanager
+def profile(memory: bool = True):
+    """ ## Profile a detection
+    Measure the time and the memory of each stage (conversion of the
+    columns, thresholds, comparison to the thresholds, positions of
+    the participants...) of everything run in the context.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Measure the peak of memory with tracemalloc, which slows the
+        computations. Default is True.
+
+    Examples
+    --------
+    ```python
+    >>> with ot.profile() as timings:
+    ...     sample = ot.Sample(df, participant_column="id")
+    ...     outliers = sample.method_SD()
+    >>> timings.to_dataframe()
+    ```
+    The same measures are kept in `outliers.timings` with
+    `sample.method_SD(profile=True)`.
+
+    Only the stages run in the thread of the profile are measured.
+    The memory is traced for the whole process, so profiles with
+    memory=True run at the same time in several threads measure the
+    allocations of each other.
+    """
+    timings = Timings(memory)
+    start_tracing = memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    token = _ACTIVE.set(timings)
+    try:
+        yield timings
+    finally:
+        _ACTIVE.reset(token)
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def stage(name: str, column=None):
+    """ Context measuring a stage of the running profile (nothing is
+    done when the profiling is disabled).
+    """
+    timings = _ACTIVE.get()
+    if timings is None:
+        return _NO_STAGE
+    return timings._stage(name, column)
+
+
+def profiled(name: str):
+    """ Decorator measuring each call of a function as a stage """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            timings = _ACTIVE.get()
+            if timings is None:
+                return function(*args, **kwargs)
+            with timings._stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
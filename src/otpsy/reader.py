@@ -0,0 +1,309 @@
+"""Read a sample from a file without loading the columns
+which are not tested"""
+import numpy as np
+import pandas as pd
+from otpsy import sketch
+from otpsy import utils
+
+
+def _select_columns(header, columns_to_test, participant_column) -> tuple:
+    """ Name of the columns to test, of the participant column and of
+    all the columns to read, from an empty dataframe having the
+    columns of the file.
+    """
+    participant_column = utils._process_participant_column(
+        header, participant_column)
+    if isinstance(columns_to_test, str) and columns_to_test in ("all", ""):
+        columns_to_test = [column for column in header.columns
+                           if column != participant_column]
+    else:
+        columns_to_test = utils._process_column_to_test(
+            header, columns_to_test)
+    if participant_column in columns_to_test:
+        raise ValueError("The participant column can't "
+                         "be in the columns you want to test")
+    usecols = list(columns_to_test)
+    if participant_column != "":
+        usecols.append(participant_column)
+    return columns_to_test, participant_column, usecols
+
+
+def _count_rows(filepath, column, chunksize, **kwargs) -> int:
+    """ Number of rows of a csv file, parsing only one column """
+    return sum(len(chunk.index) for chunk in pd.read_csv(
+        filepath, usecols=[column], chunksize=chunksize, **kwargs))
+
+
+class _ColumnBuffers:
+    """ Columns of a file filled chunk by chunk. The numeric columns
+    are arrays allocated once for all the rows, the other columns
+    (e.g. participant names) are kept by chunks.
+    """
+
+    def __init__(self, columns: list, n_rows: int) -> None:
+        self.n_rows = n_rows
+        self.arrays = dict.fromkeys(columns)
+        self.chunks = {column: [] for column in columns}
+        self.start = 0
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        stop = self.start + len(chunk.index)
+        for column, array in self.arrays.items():
+            series = chunk[column]
+            dtype = series.dtype
+            if array is None and len(self.chunks[column]) == 0 and \
+                    isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+                array = self.arrays[column] = np.empty(self.n_rows, dtype)
+            if array is None:
+                self.chunks[column].append(series)
+                continue
+            if not (isinstance(dtype, np.dtype) and dtype.kind in "biuf"):
+                # not numeric any more: the column is kept by chunks
+                self.chunks[column].append(pd.Series(array[:self.start]))
+                self.chunks[column].append(series)
+                self.arrays[column] = None
+                continue
+            if np.result_type(array.dtype, dtype) != array.dtype:
+                # e.g. integers followed by missing values
+                array = self.arrays[column] = array.astype(
+                    np.result_type(array.dtype, dtype))
+            array[self.start:stop] = series.to_numpy()
+        self.start = stop
+
+    def to_frame(self) -> pd.DataFrame:
+        columns = {}
+        for column, array in self.arrays.items():
+            if array is not None:
+                columns[column] = array[:self.start]
+            else:
+                columns[column] = pd.concat(self.chunks[column],
+                                            ignore_index=True)
+        return pd.DataFrame(columns, copy=False)
+
+
+def read_csv(
+        filepath,
+        columns_to_test: str | list[str] | int | list[int] = "all",
+        participant_column: str | int = "",
+        chunksize: int = 100_000,
+        approximate: bool = False,
+        **kwargs
+        ) -> tuple:
+    """ Read the columns to test and the participant column of a
+    csv file by chunks.
+
+    Only these columns are parsed. A first pass counts the rows (with
+    one column), so that each numeric column is allocated once. Then,
+    each chunk is converted to numeric as soon as it is read and
+    copied in these columns: the peak memory is the numeric columns
+    plus one chunk (the text of the whole file is never in memory).
+
+    Parameters
+    ----------
+    filepath : str or path
+        Path of the csv file.
+    columns_to_test : str, int or list, optional
+        Names or positions of the columns to test. Default is all
+        the columns except the participant column.
+    participant_column : str or int, optional
+        Name or position of the column refering to participants.
+    chunksize : int, optional
+        Number of rows read at once. Default is 100 000.
+    approximate : bool, optional
+        Also build a quantile sketch (sketch.QuantileSketch) of each
+        column to test, updated chunk by chunk. Default is False.
+    **kwargs
+        Keyword arguments passed to pd.read_csv (e.g. sep=";").
+
+    Returns
+    -------
+    tuple
+        The dataframe read, the name of the columns to test, the name
+        of the participant column, the missing values created by
+        the conversion to numeric (utils.NewMissingValue) and the
+        sketches by column (None if approximate is False).
+    """
+    header = pd.read_csv(filepath, nrows=0, **kwargs)
+    columns_to_test, participant_column, usecols = _select_columns(
+        header, columns_to_test, participant_column)
+
+    buffers = None
+    sketches = None
+    if approximate:
+        # seeded, so that the detection is reproducible
+        sketches = {column: sketch.QuantileSketch(seed=0)
+                    for column in columns_to_test}
+    nb = {column: np.zeros(2, dtype=np.int64) for column in columns_to_test}
+    position = {column: [] for column in columns_to_test}
+    columns_converted = set()
+    n_rows = 0
+    for chunk in pd.read_csv(filepath, usecols=usecols,
+                             chunksize=chunksize, **kwargs):
+        if buffers is None:
+            buffers = _ColumnBuffers(usecols, _count_rows(
+                filepath, usecols[0], chunksize, **kwargs))
+        before = chunk[columns_to_test].isna().sum()
+        chunk_missing = utils._convert_column_to_numeric(
+            chunk, columns_to_test, chunk=True)
+        after = chunk[columns_to_test].isna().sum()
+        for column in columns_to_test:
+            nb[column] += (before[column], after[column])
+            if approximate:
+                sketches[column].update(chunk[column].to_numpy(dtype=float))
+        for column, position_chunk in chunk_missing.position.items():
+            position[column].extend(
+                (np.asarray(position_chunk, dtype=np.int64) + n_rows).tolist())
+        columns_converted.update(chunk_missing.columns_converted)
+        n_rows += len(chunk.index)
+        buffers.add(chunk)
+
+    if buffers is None:
+        data = header[usecols]
+    else:
+        data = buffers.to_frame()
+    del buffers
+
+    # the checks done by utils._convert_column_to_numeric, on the
+    # whole columns
+    missing = utils.NewMissingValue()
+    for column in columns_to_test:
+        if column not in columns_converted:
+            continue
+        if data[column].isna().all():
+            raise TypeError(f"Can't convert {column} to numeric.")
+        number_before, number_after = nb[column].tolist()
+        missing.nb[column] = (
+            number_before, number_after, number_after - number_before)
+        missing.position[column] = sorted(position[column])
+        missing.columns_converted.append(column)
+        if number_after > number_before:
+            missing.new_missing_columns.append(column)
+    utils._warn_new_missing(
+        missing,
+        sum(int(nb[column][0]) for column in missing.columns_converted),
+        sum(int(nb[column][1]) for column in missing.columns_converted))
+    return data, columns_to_test, participant_column, missing, sketches
+
+
+def _table_to_frame(table) -> pd.DataFrame:
+    """ Dataframe of an Arrow table. The columns are not consolidated
+    in one block, so the numeric columns without missing values are
+    not copied.
+    """
+    return table.to_pandas(split_blocks=True)
+
+
+def read_parquet(
+        source,
+        columns_to_test: str | list[str] | int | list[int] = "all",
+        participant_column: str | int = "",
+        memory_map: bool = True,
+        **kwargs
+        ) -> tuple:
+    """ Read the columns to test and the participant column of a
+    Parquet file.
+
+    Only these columns are read from the file (the other columns
+    are never decoded). Numeric columns stay numeric, only the text
+    columns need a conversion.
+
+    Parameters
+    ----------
+    source : str, path or file-like object
+        The Parquet file.
+    columns_to_test : str, int or list, optional
+        Names or positions of the columns to test. Default is all
+        the columns except the participant column.
+    participant_column : str or int, optional
+        Name or position of the column refering to participants.
+    memory_map : bool, optional
+        Memory-map the file instead of reading it. Default is True.
+    **kwargs
+        Keyword arguments passed to pyarrow.parquet.read_table.
+
+    Returns
+    -------
+    tuple
+        The dataframe read, the name of the columns to test and the
+        name of the participant column.
+    """
+    # pyarrow is only loaded when a file needs it
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(source, memory_map=memory_map)
+    columns_to_test, participant_column, usecols = _select_columns(
+        pd.DataFrame(columns=schema.names), columns_to_test,
+        participant_column)
+    table = pq.read_table(source, columns=usecols,
+                          memory_map=memory_map, **kwargs)
+    return _table_to_frame(table), columns_to_test, participant_column
+
+
+def read_arrow(
+        source,
+        columns_to_test: str | list[str] | int | list[int] = "all",
+        participant_column: str | int = ""
+        ) -> tuple:
+    """ Select the columns to test and the participant column of an
+    Arrow table.
+
+    Parameters
+    ----------
+    source : pyarrow.Table, pyarrow.RecordBatch, str or path
+        The table, or the path of an Arrow IPC (Feather) file. The file
+        is memory-mapped: without compression, its numeric columns
+        are used without being read or copied.
+    columns_to_test : str, int or list, optional
+        Names or positions of the columns to test. Default is all
+        the columns except the participant column.
+    participant_column : str or int, optional
+        Name or position of the column refering to participants.
+
+    Returns
+    -------
+    tuple
+        The dataframe, the name of the columns to test and the name of
+        the participant column.
+    """
+    import pyarrow as pa
+
+    if isinstance(source, pa.RecordBatch):
+        source = pa.Table.from_batches([source])
+    elif not isinstance(source, pa.Table):
+        source = pa.ipc.open_file(pa.memory_map(str(source), "r")).read_all()
+    columns_to_test, participant_column, usecols = _select_columns(
+        pd.DataFrame(columns=source.schema.names), columns_to_test,
+        participant_column)
+    return (_table_to_frame(source.select(usecols)), columns_to_test,
+            participant_column)
+
+
+def read_polars(
+        frame,
+        columns_to_test: str | list[str] | int | list[int] = "all",
+        participant_column: str | int = ""
+        ) -> tuple:
+    """ Select the columns to test and the participant column of a
+    Polars dataframe.
+
+    A LazyFrame is only collected after the selection, so that only
+    these columns are read (e.g. from pl.scan_parquet). The pandas
+    dataframe shares the numeric columns without missing values
+    with the Polars dataframe (through Arrow).
+
+    Returns
+    -------
+    tuple
+        The pandas dataframe, the name of the columns to test, the
+        name of the participant column and the Polars dataframe of
+        the columns to test.
+    """
+    columns_to_test, participant_column, usecols = _select_columns(
+        pd.DataFrame(columns=frame.collect_schema().names()),
+        columns_to_test, participant_column)
+    frame = frame.select(usecols)
+    if type(frame).__name__ == "LazyFrame":
+        frame = frame.collect()
+    data = _table_to_frame(frame.to_arrow())
+    return data, columns_to_test, participant_column, \
+        frame.select(columns_to_test)
@@ -0,0 +1,152 @@
+"""Mergeable quantile sketch used by the approximate thresholds"""
+import numpy as np
+from otpsy import config
+
+# ratio between the capacity of two consecutive levels
+_CAPACITY_RATIO = 2 / 3
+
+
+def rank_error(k: int) -> float:
+    """ Normalized rank error of a sketch with parameter k
+
+    With a probability of 99%, the rank of a quantile returned by the
+    sketch is at most rank_error(k) * n away from the exact rank
+    (n is the number of values). The formula is the empirical bound
+    given for the KLL sketch by the Apache DataSketches library.
+    For the default k = 200, the error is about 1.3%.
+    """
+    return 2.296 / k ** 0.9723
+
+
+class QuantileSketch:
+    """ KLL quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    The sketch summarises a stream of values in a small memory
+    (at most about 3k values, whatever the number of values) and gives
+    approximate quantiles with a rank error bounded by rank_error(k).
+
+    Values are stored in levels. A value of level h stands for 2^h
+    values of the stream. When a level exceeds its capacity, it is
+    sorted and one value out of two (starting randomly at the first
+    or the second) is promoted to the next level.
+
+    Sketches are mergeable: a sketch can be built for each chunk of
+    a file or for each worker, and the sketches merged afterwards,
+    with the same error bound as a sketch built on all the values.
+
+    Parameters
+    ----------
+    k : int, optional
+        Accuracy parameter (see rank_error). Default is
+        config.SKETCH_K.
+    seed : int, optional
+        Seed of the random promotion, for reproducibility.
+
+    Examples
+    --------
+    ```python
+    >>> sketch = ot.QuantileSketch()
+    >>> for chunk in pd.read_csv("data.csv", chunksize=100_000):
+    ...     sketch.update(chunk["A"])
+    >>> q1, q3 = sketch.quantile([0.25, 0.75])
+    ```
+    """
+
+    def __init__(self, k: int | None = None, seed: int | None = None) -> None:
+        self.k = config.SKETCH_K if k is None else int(k)
+        if self.k < 2:
+            raise ValueError("k needs to be at least 2.")
+        self.n = 0
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(
+            cls,
+            values,
+            k: int | None = None,
+            seed: int | None = None
+            ) -> "QuantileSketch":
+        """ Sketch of an array of values """
+        sketch = cls(k, seed)
+        sketch.update(values)
+        return sketch
+
+    @property
+    def rank_error(self) -> float:
+        """ Normalized rank error of the sketch (see rank_error) """
+        return rank_error(self.k)
+
+    def __len__(self) -> int:
+        """ Number of values stored in the sketch """
+        return sum(len(level) for level in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(np.ceil(self.k * _CAPACITY_RATIO ** depth)), 2)
+
+    def update(self, values) -> "QuantileSketch":
+        """ Add values (missing values are ignored) """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        # the values are added by slices to bound the memory
+        size = config.SKETCH_BUFFER_SIZE
+        for start in range(0, len(values), size):
+            piece = values[start:start + size]
+            self._levels[0] = np.concatenate([self._levels[0], piece])
+            self.n += len(piece)
+            self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """ Add the values summarised by another sketch """
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                # an odd value stays at this level
+                leftover = items[:len(items) % 2]
+                items = items[len(items) % 2:]
+                promoted = items[self._rng.integers(2)::2]
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                self._levels[level] = leftover
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], promoted])
+                # adding a level reduces the capacity of the others
+                level = 0
+            else:
+                level += 1
+
+    def quantile(self, q: float | list[float]) -> float | np.ndarray:
+        """ Approximate quantile(s) of the values
+
+        Like np.quantile with the linear interpolation, which gives
+        exactly the same result while the sketch has not compressed
+        any value. If the sketch is empty, NaN is returned.
+        """
+        q_array = np.asarray(q, dtype=float)
+        if np.any((q_array < 0) | (q_array > 1)):
+            raise ValueError("Quantiles need to be between 0 and 1.")
+        if self.n == 0:
+            return np.full(q_array.shape, np.nan)[()]
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(values), 2.0 ** level)
+                                  for level, values in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        items, weights = items[order], weights[order]
+        # each value stands for the ranks it covers, the rank of the
+        # value is the middle of them
+        rank = np.cumsum(weights) - (weights + 1) / 2
+        total = weights.sum()
+        return np.interp(q_array * (total - 1), rank, items)[()]
@@ -1,6 +1,524 @@
+import warnings
 import pandas as pd
 import numpy as np
 from otpsy import mathematics
+from otpsy import sketch
+from otpsy import cache
+
+
+def _numeric_block(
+    df: pd.DataFrame,
+    column_to_test: list
+) -> np.ndarray:
+    """ Private function
+
+    Return the 2-D block (rows x columns) of the columns to test
+    as floats.
+    """
+    return df[column_to_test].to_numpy(dtype=float)
+
+
+def _format_threshold(
+    column_to_test: list,
+    low_threshold: np.ndarray,
+    high_threshold: np.ndarray
+) -> tuple | dict:
+    """ Private function
+
+    Give the output of the threshold functions: a tuple when only
+    one column is tested and a dictionnary {column: (low, high)}
+    otherwise.
+    """
+    # avoid having a dictionnary for one column
+    if len(column_to_test) == 1:
+        return low_threshold[0], high_threshold[0]
+    else:
+        return {column: (low_threshold[j], high_threshold[j])
+                for j, column in enumerate(column_to_test)}
+
+
+def _nan_reduction(func, values, *args, **kwargs):
+    """ Private function
+
+    Apply a NaN-aware reduction along the rows, without warning
+    for the columns that only contain missing values.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return func(values, *args, axis=0, **kwargs)
+
+
+def _block_statistics(
+    values: np.ndarray,
+    names: list
+) -> dict:
+    """ Summary statistics of every column of a 2-D block
+
+    The name of a statistic is "median", "q1", "q3", "mean", "sd",
+    "n_valid", ("mad", b) (median absolute distance multiplied by b)
+    or ("percentile", p). Returns, for each statistic, an array with
+    a value by column.
+    """
+    statistics = {}
+    # one sort of the block for the median and the quantiles
+    sorted_values = False
+    if any(name in ("q1", "q3", "median") or isinstance(name, tuple)
+           for name in names):
+        sorted_values = mathematics.sorted_block(values)
+    if "q1" in names or "q3" in names:
+        statistics["q1"], statistics["q3"] = mathematics.nanquantile_block(
+            values, [0.25, 0.75], sorted_values)
+    if "median" in names or any(isinstance(name, tuple) and name[0] == "mad"
+                                for name in names):
+        statistics["median"] = mathematics.nanmedian_block(
+            values, sorted_values)
+    if "mean" in names:
+        statistics["mean"] = _nan_reduction(np.nanmean, values)
+    if "sd" in names:
+        statistics["sd"] = _nan_reduction(np.nanstd, values)
+    if "n_valid" in names:
+        statistics["n_valid"] = (~np.isnan(values)).sum(axis=0)
+    for name in names:
+        if isinstance(name, tuple) and name[0] == "mad":
+            statistics[name] = mathematics.compute_mad_block(
+                values, statistics["median"], name[1])
+        elif isinstance(name, tuple) and name[0] == "percentile":
+            statistics[name] = mathematics.nanquantile_block(
+                values, np.true_divide(name[1], 100), sorted_values)
+    return {name: statistics[name] for name in names}
+
+
+def _polars_expression(values, name):
+    """ Polars expression of a statistic of _block_statistics """
+    if name == "median":
+        return values.median()
+    elif name == "q1":
+        return values.quantile(0.25, interpolation="linear")
+    elif name == "q3":
+        return values.quantile(0.75, interpolation="linear")
+    elif name == "mean":
+        return values.mean()
+    elif name == "sd":
+        return values.std(ddof=0)
+    elif name == "n_valid":
+        return values.count()
+    elif name[0] == "mad":
+        return (values - values.median()).abs().median() * name[1]
+    else:
+        return values.quantile(name[1] / 100, interpolation="linear")
+
+
+def _polars_values(column):
+    """ Polars expression of the values of a column as floats, NaN
+    being a missing value (like the NaN-aware functions of NumPy).
+    """
+    import polars as pl
+    return pl.col(column).cast(pl.Float64).fill_nan(None)
+
+
+def _polars_statistics(
+    frame,
+    names: list
+) -> dict:
+    """ Same as _block_statistics, for the columns of a Polars
+    dataframe. All the statistics are computed in one query, so that
+    Polars computes them in parallel.
+    """
+    expressions = [
+        _polars_expression(_polars_values(column), name).alias(f"{j}_{k}")
+        for j, column in enumerate(frame.columns)
+        for k, name in enumerate(names)]
+    row = np.array(frame.select(expressions).row(0), dtype=float)
+    # one row of statistics by column
+    row = row.reshape(len(frame.columns), len(names))
+    return {name: row[:, k] for k, name in enumerate(names)}
+
+
+def _polars_flags(
+    frame,
+    low_threshold: np.ndarray,
+    high_threshold: np.ndarray,
+    threshold_included: bool = False
+) -> np.ndarray:
+    """ Boolean block (rows x columns) of the values of a Polars
+    dataframe outside the thresholds of their column.
+    """
+    import polars as pl
+
+    expressions = []
+    for j, column in enumerate(frame.columns):
+        values = _polars_values(column)
+        # a NaN threshold flags nothing, as with NumPy (Polars sorts
+        # NaN after every value)
+        flagged = pl.repeat(False, pl.len())
+        if not np.isnan(low_threshold[j]):
+            flagged = flagged | (values <= low_threshold[j]
+                                 if threshold_included
+                                 else values < low_threshold[j])
+        if not np.isnan(high_threshold[j]):
+            flagged = flagged | (values >= high_threshold[j]
+                                 if threshold_included
+                                 else values > high_threshold[j])
+        expressions.append(flagged.fill_null(False).alias(str(j)))
+    return frame.select(expressions).to_numpy()
+
+
+def _method_statistics(
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826
+) -> list:
+    """ Name of the statistics needed by the thresholds of a method """
+    if method == "iqr":
+        return ["q1", "q3", "median"]
+    elif method in ("sd", "rsd"):
+        return ["mean", "sd"]
+    elif method == "mad":
+        return ["median", ("mad", b)]
+    elif method == "tukey":
+        return ["q1", "q3"]
+    else:
+        _check_prctile(distance)
+        return [("percentile", 100 - distance), ("percentile", distance)]
+
+
+def _thresholds_from_statistics(
+    method: str,
+    statistics: dict,
+    distance: float | int,
+    b: float | int = 1.4826
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Low and high thresholds of a method from its statistics """
+    if method == "iqr":
+        iqr = statistics["q3"] - statistics["q1"]
+        med = statistics["median"]
+        low_threshold = np.round(med - (distance * iqr), 3)
+        high_threshold = np.round(med + (distance * iqr), 3)
+    elif method in ("sd", "rsd"):
+        moy, sd = statistics["mean"], statistics["sd"]
+        low_threshold = np.round(moy - distance * sd, 3)
+        high_threshold = np.round(moy + distance * sd, 3)
+    elif method == "mad":
+        med, mad = statistics["median"], statistics[("mad", b)]
+        low_threshold = med - (distance * mad)
+        high_threshold = med + (distance * mad)
+    elif method == "tukey":
+        q1, q3 = statistics["q1"], statistics["q3"]
+        iqr = q3 - q1
+        low_threshold = q1 - distance * iqr
+        high_threshold = q3 + distance * iqr
+    else:
+        low_threshold = statistics[("percentile", 100 - distance)]
+        high_threshold = statistics[("percentile", distance)]
+    return low_threshold, high_threshold
+
+
+def _iqr_block(
+    values: np.ndarray,
+    distance: float | int
+) -> tuple[np.ndarray, np.ndarray]:
+    """ IQR thresholds of every column of a 2-D block """
+    return _thresholds_from_statistics("iqr", _block_statistics(
+        values, _method_statistics("iqr", distance)), distance)
+
+
+def _sd_block(
+    values: np.ndarray,
+    distance: float | int
+) -> tuple[np.ndarray, np.ndarray]:
+    """ SD thresholds of every column of a 2-D block """
+    return _thresholds_from_statistics("sd", _block_statistics(
+        values, _method_statistics("sd", distance)), distance)
+
+
+def _mad_block(
+    values: np.ndarray,
+    distance: float | int,
+    b: float | int
+) -> tuple[np.ndarray, np.ndarray]:
+    """ MAD thresholds of every column of a 2-D block """
+    return _thresholds_from_statistics("mad", _block_statistics(
+        values, _method_statistics("mad", distance, b)), distance, b)
+
+
+def _tukey_block(
+    values: np.ndarray,
+    distance: float | int
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Tukey thresholds of every column of a 2-D block """
+    return _thresholds_from_statistics("tukey", _block_statistics(
+        values, _method_statistics("tukey", distance)), distance)
+
+
+def _check_prctile(distance: float | int) -> None:
+    if distance >= 100 or distance <= 50:
+        raise ValueError("Distance needs to be above 50"
+                         " and below 100. Check documentation for more"
+                         " information about percentile computation.")
+
+
+def _prctile_block(
+    values: np.ndarray,
+    distance: float | int
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Percentile thresholds of every column of a 2-D block """
+    return _thresholds_from_statistics("prctile", _block_statistics(
+        values, _method_statistics("prctile", distance)), distance)
+
+
+def _cached_thresholds(
+    df: pd.DataFrame,
+    column_to_test: list,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826,
+    values: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Private function
+
+    Same as _block_thresholds, but the statistics are taken from the
+    cache of the dataframe (see cache.py) when they are already
+    computed. values is the block of the columns, if it is
+    already extracted.
+    """
+    if method not in _BLOCK_FUNCTION:
+        raise ValueError(f"The method \"{method}\" has no threshold "
+                         "computed column by column.")
+    statistics = cache.summary_statistics(df).get(
+        column_to_test, _method_statistics(method, distance, b), values)
+    return _thresholds_from_statistics(method, statistics, distance, b)
+
+
+_BLOCK_FUNCTION = {
+    "iqr": _iqr_block,
+    "sd": _sd_block,
+    "rsd": _sd_block,
+    "mad": _mad_block,
+    "tukey": _tukey_block,
+    "prctile": _prctile_block,
+}
+
+
+def _grouped_block_thresholds(
+    values: np.ndarray,
+    codes: np.ndarray,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Private function
+
+    Thresholds of every group and every column of a 2-D block, with
+    groupby reductions. codes gives the group (0 to n_groups - 1) of
+    each row, -1 for the rows without group.
+
+    Returns the low thresholds and the high thresholds as 2-D arrays
+    (groups x columns).
+    """
+    if method not in _BLOCK_FUNCTION:
+        raise ValueError(f"The method \"{method}\" has no threshold "
+                         "computed column by column.")
+    has_group = codes >= 0
+    values, codes = values[has_group], codes[has_group]
+    grouped = pd.DataFrame(values).groupby(codes, sort=True)
+    n_groups = grouped.ngroups
+
+    def quantiles(q):
+        # one array (groups x columns) by quantile
+        result = grouped.quantile(q).to_numpy()
+        return result.reshape(n_groups, len(q), -1).transpose(1, 0, 2)
+
+    if method == "iqr":
+        q1, med, q3 = quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return (np.round(med - (distance * iqr), 3),
+                np.round(med + (distance * iqr), 3))
+    elif method in ("sd", "rsd"):
+        sd = grouped.std(ddof=0).to_numpy()
+        moy = grouped.mean().to_numpy()
+        return (np.round(moy - distance * sd, 3),
+                np.round(moy + distance * sd, 3))
+    elif method == "mad":
+        med = grouped.median().to_numpy()
+        mad = pd.DataFrame(np.abs(values - med[codes])).groupby(
+            codes, sort=True).median().to_numpy() * b
+        return med - (distance * mad), med + (distance * mad)
+    elif method == "tukey":
+        q1, q3 = quantiles([0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - distance * iqr, q3 + distance * iqr
+    else:
+        _check_prctile(distance)
+        low_threshold, high_threshold = quantiles(
+            [(100 - distance) / 100, distance / 100])
+        return low_threshold, high_threshold
+
+
+# methods whose thresholds can be computed from quantile sketches
+_SKETCH_METHOD = ("iqr", "mad", "tukey", "prctile")
+
+
+def thresholds_from_sketches(
+    sketches: list,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826,
+    deviation_sketches: list | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Approximate thresholds from quantile sketches
+
+    The sketches (sketch.QuantileSketch) can be built by chunk or by
+    worker and merged before. The rank error of the quantiles used
+    is bounded by sketch.rank_error(k).
+
+    Parameters
+    ------------
+        sketches: list
+            One sketch of the values of each column
+        method: str
+            Shortname of the method ("iqr", "mad", "tukey" or "prctile")
+        distance: float | int
+            The distance used to calculate threshold
+        b: float | int
+            Constant used by the "mad" method. Default is 1.4826.
+        deviation_sketches: list, optional
+            Only for the "mad" method, one sketch of the absolute
+            distance to the median of each column (the median is given
+            by the first sketches, so it needs a second pass on
+            the values).
+
+    Returns
+    -------
+        tuple[np.ndarray, np.ndarray]
+            The low thresholds and the high thresholds, in the order
+            of the sketches.
+    """
+    if method not in _SKETCH_METHOD:
+        raise ValueError(f"The method \"{method}\" can't be computed "
+                         "from quantile sketches.")
+
+    def quantiles(sketches_used, q):
+        # one row by quantile, one column by sketch
+        return np.array([sketch_used.quantile(q)
+                         for sketch_used in sketches_used]).reshape(-1, len(q)).T
+
+    if method == "iqr":
+        q1, med, q3 = quantiles(sketches, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        return (np.round(med - (distance * iqr), 3),
+                np.round(med + (distance * iqr), 3))
+    elif method == "tukey":
+        q1, q3 = quantiles(sketches, [0.25, 0.75])
+        iqr = q3 - q1
+        return q1 - distance * iqr, q3 + distance * iqr
+    elif method == "prctile":
+        _check_prctile(distance)
+        return quantiles(sketches, [(100 - distance) / 100, distance / 100])
+    else:
+        if deviation_sketches is None:
+            raise ValueError("The \"mad\" method needs the sketches of "
+                             "the absolute distance to the median.")
+        med, = quantiles(sketches, [0.5])
+        mad, = quantiles(deviation_sketches, [0.5])
+        return med - (distance * mad * b), med + (distance * mad * b)
+
+
+def _approximate_block(
+    values: np.ndarray,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826,
+    sketches: list | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Private function
+
+    Approximate thresholds of every column of a 2-D block, with
+    quantile sketches instead of exact quantiles. The sketches built
+    while the columns were read by chunks can be given, otherwise
+    they are built from the block (which only adds an error).
+    """
+    if sketches is None:
+        # seeded, so that the detection is reproducible
+        sketches = [sketch.QuantileSketch.from_values(values[:, j], seed=0)
+                    for j in range(values.shape[1])]
+    deviation_sketches = None
+    if method == "mad":
+        med = np.array([sketch_used.quantile(0.5) for sketch_used in sketches])
+        deviation_sketches = [
+            sketch.QuantileSketch.from_values(
+                np.abs(values[:, j] - med[j]), seed=0)
+            for j in range(values.shape[1])]
+    return thresholds_from_sketches(
+        sketches, method, distance, b, deviation_sketches)
+
+
+def compute_thresholds(
+    df: pd.DataFrame,
+    column_to_test: list,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826,
+    approximate: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Thresholds of several columns in one pass
+
+    This function computes the low and the high thresholds of every
+    column to test at once. The columns are taken as a single 2-D
+    block and the statistics are computed with NaN-aware reductions
+    along the rows.
+
+    Parameters
+    ------------
+        df: pd.DataFrame
+            The dataframe used
+        column_to_test: list
+            The name of the columns of interest
+        method: str
+            Shortname of the method ("iqr", "sd", "rsd", "mad",
+            "tukey" or "prctile")
+        distance: float | int
+            The distance used to calculate threshold
+        b: float | int
+            Constant used by the "mad" method. Default is 1.4826.
+        approximate: bool
+            If True, the quantiles of the "iqr", "mad", "tukey" and
+            "prctile" methods are given by quantile sketches built
+            from the columns. As the columns are already in memory,
+            it only adds an error: use thresholds_from_sketches on
+            sketches built by chunks (or Sample.from_csv with
+            approximate=True) to save memory. Default is False.
+
+    Returns
+    -------
+        tuple[np.ndarray, np.ndarray]
+            The low thresholds and the high thresholds, in the order
+            of column_to_test.
+    """
+    if approximate:
+        return _approximate_block(
+            _numeric_block(df, column_to_test), method, distance, b)
+    return _cached_thresholds(df, column_to_test, method, distance, b)
+
+
+def _block_thresholds(
+    values: np.ndarray,
+    method: str,
+    distance: float | int,
+    b: float | int = 1.4826,
+    approximate: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """ Private function
+
+    Same as compute_thresholds, on a 2-D block already extracted.
+    """
+    if approximate:
+        return _approximate_block(values, method, distance, b)
+    if method not in _BLOCK_FUNCTION:
+        raise ValueError(f"The method \"{method}\" has no threshold "
+                         "computed column by column.")
+    if method == "mad":
+        return _BLOCK_FUNCTION[method](values, distance, b)
+    return _BLOCK_FUNCTION[method](values, distance)
 
 
 def threshold_iqr(
@@ -23,25 +541,9 @@ def threshold_iqr(
         distance: float | int
             The distance used to calculate threshold
     """
-    # calculate the interquartile range and the median
-    ret = {}
-    for column in column_to_test:
-        q1, q3 = df[column].quantile([0.25, 0.75])
-        iqr = q3-q1
-
-        med = np.nanmedian(df[column])
-
-        # threshold
-        low_threshold = round(med - (distance * iqr), 3)
-        high_threshold = round(med + (distance * iqr), 3)
-
-        ret[column] = (low_threshold, high_threshold)
-
-    # avoid having a dictionnary for one column
-    if len(column_to_test) == 1:
-        return ret[column_to_test[0]][0], ret[column_to_test[0]][1]
-    else:
-        return ret
+    low_threshold, high_threshold = _cached_thresholds(
+        df, column_to_test, "iqr", distance)
+    return _format_threshold(column_to_test, low_threshold, high_threshold)
 
 
 def threshold_sd(
@@ -64,23 +566,9 @@ def threshold_sd(
         distance: float | int
             The distance used to calculate threshold
     """
-    # calculate the interquartile range and the median
-    ret = {}
-    for column in column_to_test:
-        sd = np.nanstd(df[column])
-        # Pareil que IQR
-        moy = np.nanmean(df[column])
-        # définition des bornes
-        low_threshold = round(moy - distance * sd, 3)
-        high_threshold = round(moy + distance * sd, 3)
-
-        ret[column] = (low_threshold, high_threshold)
-
-    # avoid having a dictionnary for one column
-    if len(column_to_test) == 1:
-        return ret[column_to_test[0]][0], ret[column_to_test[0]][1]
-    else:
-        return ret
+    low_threshold, high_threshold = _cached_thresholds(
+        df, column_to_test, "sd", distance)
+    return _format_threshold(column_to_test, low_threshold, high_threshold)
 
 
 def threshold_mad(
@@ -104,21 +592,9 @@ def threshold_mad(
         distance: float | int
             The distance used to calculate threshold
     """
-    ret = {}
-    for column in column_to_test:
-        med = np.nanmedian(df[column])
-        mad = mathematics.compute_mad(df, column, med, b)
-
-        # threshold
-        low_threshold = med - (distance * mad)
-        high_threshold = med + (distance * mad)
-
-        ret[column] = (low_threshold, high_threshold)
-    # avoid having a dictionnary for one column
-    if len(column_to_test) == 1:
-        return ret[column_to_test[0]][0], ret[column_to_test[0]][1]
-    else:
-        return ret
+    low_threshold, high_threshold = _cached_thresholds(
+        df, column_to_test, "mad", distance, b)
+    return _format_threshold(column_to_test, low_threshold, high_threshold)
 
 
 def threshold_tukey(
@@ -141,20 +617,9 @@ def threshold_tukey(
         distance: float | int
             The distance used to calculate threshold
     """
-    ret = {}
-    for column in column_to_test:
-        q1, q3 = df[column].quantile([0.25, 0.75])
-        iqr = q3-q1
-
-        low_threshold = q1 - distance*iqr
-        high_threshold = q3 + distance*iqr
-        ret[column] = (low_threshold, high_threshold)
-
-    # avoid having a dictionnary for one column
-    if len(column_to_test) == 1:
-        return ret[column_to_test[0]][0], ret[column_to_test[0]][1]
-    else:
-        return ret
+    low_threshold, high_threshold = _cached_thresholds(
+        df, column_to_test, "tukey", distance)
+    return _format_threshold(column_to_test, low_threshold, high_threshold)
 
 
 def threshold_sn(
@@ -215,22 +680,9 @@ def threshold_prctile(
         distance: float | int
             The distance used to calculate threshold
     """
-    if distance >= 100 or distance <= 50:
-        raise ValueError("Distance needs to be above 50"
-                         " and below 100. Check documentation for more"
-                         " information about percentile computation.")
-    ret = {}
-    for column in column_to_test:
-        # threshold computation
-        low_threshold = np.nanpercentile(df[column], 100- distance)
-        high_threshold = np.nanpercentile(df[column], distance)
-        ret[column] = (low_threshold, high_threshold)
-
-    # avoid having a dictionnary for one column
-    if len(column_to_test) == 1:
-        return ret[column_to_test[0]][0], ret[column_to_test[0]][1]
-    else:
-        return ret
+    low_threshold, high_threshold = _cached_thresholds(
+        df, column_to_test, "prctile", distance)
+    return _format_threshold(column_to_test, low_threshold, high_threshold)
 
 
 def threshold_identical(
@@ -249,10 +701,176 @@ def threshold_identical(
         column_to_test: str | list | int | pd.Series
             The name of the colum of interest
     """
-    ret = {}
     # get the maximal frequency of the item
-    all_max_frequency = df[column_to_test].apply(
-        lambda x: x.value_counts(), axis=1).max(axis=1)
+    all_max_frequency = pd.Series(
+        mathematics.max_frequency(df[column_to_test].to_numpy()),
+        index=df.index)
     ret = all_max_frequency.div(len(column_to_test))
 
     return ret
+
+
+# methods available in sweep_distances
+_SWEEP_METHOD = ("iqr", "sd", "mad", "tukey", "prctile", "sn")
+
+
+def _count_flagged(
+    sorted_values: np.ndarray,
+    low_threshold: np.ndarray,
+    high_threshold: np.ndarray,
+    threshold_included: bool
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Private function
+
+    For each pair of thresholds, returns three arrays: the number of
+    values flagged, and the start and the stop positions (in
+    sorted_values) delimiting the values kept, i.e. the values flagged
+    are sorted_values[:start] and sorted_values[stop:].
+    A missing threshold flags nothing.
+    """
+    low_threshold = np.where(np.isnan(low_threshold), -np.inf, low_threshold)
+    high_threshold = np.where(np.isnan(high_threshold), np.inf, high_threshold)
+    if threshold_included:
+        start = np.searchsorted(sorted_values, low_threshold, "right")
+        stop = np.searchsorted(sorted_values, high_threshold, "left")
+    else:
+        start = np.searchsorted(sorted_values, low_threshold, "left")
+        stop = np.searchsorted(sorted_values, high_threshold, "right")
+    stop = np.maximum(stop, start)
+    return len(sorted_values) - (stop - start), start, stop
+
+
+def sweep_distances(
+    df: pd.DataFrame,
+    column_to_test: list,
+    distances: list | dict,
+    methods: list = ("iqr", "sd", "mad", "tukey"),
+    threshold_included: bool = False,
+    b: float | int = 1.4826,
+    return_index: bool = False
+) -> pd.DataFrame:
+    """ Number of flagged values for many distances
+
+    The statistics of each method (centre and scale) are computed
+    once for every column, and each column is sorted once. For each
+    distance, the thresholds are then a linear function of the
+    distance and the number of flagged values is given by a binary
+    search in the sorted column. The results are the same as the
+    ones of the method_* of a Sample.
+
+    Parameters
+    ------------
+        df: pd.DataFrame
+            The dataframe used
+        column_to_test: list
+            The name of the columns of interest
+        distances: list | dict
+            The distances to test, for every method, or a dictionnary
+            {method: distances} (e.g. the percentile method needs
+            distances between 50 and 100).
+        methods: list
+            Shortname of the methods ("iqr", "sd", "mad", "tukey",
+            "prctile" or "sn"). Default is iqr, sd, mad and tukey.
+        threshold_included: bool
+            If True, the detection is inclusive (>= or <=).
+            Default is False.
+        b: float | int
+            Constant used by the "mad" method. Default is 1.4826.
+        return_index: bool
+            If True, a column "flagged" contains the list of the
+            index of the flagged values. Default is False.
+
+    Returns
+    -------
+        pd.DataFrame
+            One row by column, method and distance, with the
+            thresholds and the number of flagged values (n_flagged).
+    """
+    methods = list(methods)
+    for method in methods:
+        if method not in _SWEEP_METHOD:
+            raise ValueError(f"The method \"{method}\" is not available "
+                             "in the sweep.")
+    if not isinstance(distances, dict):
+        distances = {method: distances for method in methods}
+    distances = {method: np.atleast_1d(np.asarray(distances[method],
+                                                  dtype=float))
+                 for method in methods}
+    if "prctile" in methods:
+        for distance in distances["prctile"]:
+            _check_prctile(distance)
+
+    values = _numeric_block(df, column_to_test)
+    # centre and scale of every column, computed once (or taken from
+    # the cache): low = low_centre - distance * scale,
+    # high = high_centre + distance * scale
+    names = []
+    for method in methods:
+        if method in ("iqr", "sd", "mad", "tukey"):
+            names.extend(name for name in _method_statistics(method, 0, b)
+                         if name not in names)
+    summary = cache.summary_statistics(df).get(column_to_test, names, values)
+    statistics = {}
+    if "iqr" in methods:
+        statistics["iqr"] = (summary["median"], summary["median"],
+                             summary["q3"] - summary["q1"])
+    if "tukey" in methods:
+        statistics["tukey"] = (summary["q1"], summary["q3"],
+                               summary["q3"] - summary["q1"])
+    if "mad" in methods:
+        statistics["mad"] = (summary["median"], summary["median"],
+                             summary[("mad", b)])
+    if "sd" in methods:
+        statistics["sd"] = (summary["mean"], summary["mean"], summary["sd"])
+
+    results = []
+    for j, column in enumerate(column_to_test):
+        column_values = values[:, j]
+        order = np.argsort(column_values, kind="stable")
+        sorted_values = column_values[order]
+        sorted_values = sorted_values[~np.isnan(sorted_values)]
+        for method in methods:
+            distance = distances[method]
+            tested_values, tested_order = sorted_values, order
+            if method == "prctile":
+                if len(sorted_values) > 0:
+                    low_threshold = np.percentile(sorted_values, 100 - distance)
+                    high_threshold = np.percentile(sorted_values, distance)
+                else:
+                    low_threshold = high_threshold = \
+                        np.full(len(distance), np.nan)
+            elif method == "sn":
+                # the median distances to other points are compared
+                # to the threshold
+                sn, all_median = mathematics.S_n(df, column)
+                all_median = all_median.to_numpy(dtype=float)
+                tested_order = np.argsort(all_median, kind="stable")
+                tested_values = all_median[tested_order]
+                tested_values = tested_values[~np.isnan(tested_values)]
+                low_threshold = np.full(len(distance), np.nan)
+                high_threshold = sn * distance
+            else:
+                low_centre, high_centre, scale = statistics[method]
+                low_threshold = low_centre[j] - distance * scale[j]
+                high_threshold = high_centre[j] + distance * scale[j]
+                if method in ("iqr", "sd"):
+                    low_threshold = np.round(low_threshold, 3)
+                    high_threshold = np.round(high_threshold, 3)
+
+            n_flagged, start, stop = _count_flagged(
+                tested_values, low_threshold, high_threshold,
+                threshold_included)
+            result = pd.DataFrame({
+                "column": column, "method": method, "distance": distance,
+                "low_threshold": low_threshold,
+                "high_threshold": high_threshold,
+                "n_flagged": n_flagged})
+            if return_index:
+                result["flagged"] = [
+                    df.index[np.sort(np.concatenate([
+                        tested_order[:start[k]],
+                        tested_order[stop[k]:len(tested_values)]]))].tolist()
+                    for k in range(len(distance))]
+            results.append(result)
+
+    return pd.concat(results, ignore_index=True)
@@ -1,8 +1,15 @@
-from pandas.api.types import is_numeric_dtype, is_float_dtype
+from pandas.api.types import is_numeric_dtype, is_float_dtype, \
+    is_integer_dtype, is_bool_dtype, is_object_dtype, is_string_dtype, \
+    is_extension_array_dtype
 from inspect import signature
+from functools import wraps
 import pandas as pd
 import numpy as np
-from copy import deepcopy
+from copy import copy
+from contextlib import nullcontext
+from otpsy import config
+from otpsy import flags
+from otpsy import profiling
 
 
 class NewMissingValue:
@@ -50,6 +57,15 @@ new missing value(s).\n"""
         return final_text
 
 
+def _column_name_at(df_func, position):
+    """ Name of the column at a position, like
+    df_func.iloc[:, position].name without extracting the column
+    """
+    if not -len(df_func.columns) <= position < len(df_func.columns):
+        raise IndexError("single positional indexer is out-of-bounds")
+    return df_func.columns[position]
+
+
 def _process_column_to_test(df_func, pre_column):
     """This function aim to process the keyword argument column to test"""
 
@@ -72,7 +88,7 @@ def _process_column_to_test(df_func, pre_column):
 
     # if the person enters the index of the column
     elif isinstance(pre_column, int):
-        columns_to_test.append(df_func.iloc[:, pre_column].name)
+        columns_to_test.append(_column_name_at(df_func, pre_column))
 
     # if the person enters a list
     elif isinstance(pre_column, list):
@@ -96,7 +112,7 @@ def _process_column_to_test(df_func, pre_column):
 
             # it is the index of column
             elif isinstance(col, int):
-                columns_to_test.append(df_func.iloc[:, col].name)
+                columns_to_test.append(_column_name_at(df_func, col))
     else:
         raise TypeError(f"The type of data {type(pre_column)} "
                         "is not supported to refer column.")
@@ -111,7 +127,7 @@ def _process_participant_column(df_func, pre_participant_column):
 
     elif isinstance(pre_participant_column, int):
         participant_column = \
-            df_func.iloc[:, pre_participant_column].name
+            _column_name_at(df_func, pre_participant_column)
 
     elif isinstance(pre_participant_column, str):
         if pre_participant_column not in df_func.columns \
@@ -126,6 +142,10 @@ def _process_participant_column(df_func, pre_participant_column):
 
 
 def _process_distance(value):
+    # numbers don't need to be parsed (a bool is not accepted)
+    if isinstance(value, (int, float, np.integer, np.floating)) \
+            and not isinstance(value, (bool, np.bool_)):
+        return float(value)
     try:
         distance = float(str(value).replace(r"\.", ","))
     except ValueError:
@@ -135,48 +155,87 @@ def _process_distance(value):
     return distance
 
 
-def _convert_column_to_numeric(df_func, column_to_test_func):
+def _to_numeric(series):
+    """ Values of a column in a numeric format (NaN when a value can't
+    be converted). Only the text is parsed, and the decimal comma is
+    only replaced when the text can't be parsed as it is.
     """
-    to convert column in a numeric format
+    if is_bool_dtype(series) or \
+            (is_extension_array_dtype(series) and is_numeric_dtype(series)):
+        # e.g. bool, "Int64", "boolean": NA becomes NaN
+        return series.astype(float)
+    if is_object_dtype(series) or is_string_dtype(series):
+        try:
+            return pd.to_numeric(series)
+        except (ValueError, TypeError):
+            # decimal comma or values that can't be converted
+            pass
+    # other types (dates, categories...) are parsed as text
+    if not isinstance(series.dtype, pd.StringDtype):
+        series = series.astype(str)
+    return pd.to_numeric(
+        series.str.replace(",", ".", regex=False), errors="coerce")
+
+
+def _convert_column_to_numeric(df_func, column_to_test_func, chunk=False):
     """
-    # Before and after modifying are present to track
-    # the number of missing values. This information
-    # will be use to give a feedback to the user.
+    to convert column in a numeric format
+
+    Float and integer columns are kept as they are. The new missing
+    values of the converted columns are tracked with boolean masks.
 
-    before_transforming = df_func.isna().sum().sum()
+    If chunk is True, df_func is only a part of the data (see
+    reader.read_csv): the caller checks the whole columns and gives
+    the feedback to the user.
+    """
+    # The new missing values are tracked to give a
+    # feedback to the user.
     missing = NewMissingValue()
+    total_new_missing = 0
 
     # convert each column that is not a float
     # or integer
     for column in column_to_test_func:
-        if not is_float_dtype(df_func[column]) or \
-           not is_numeric_dtype(df_func[column]):
-            # track the change on Na
-            number_before = df_func[column].isna().sum()
-            position_before = np.where(df_func[column].isnull())[0]
+        series = df_func[column]
+        if (is_float_dtype(series) or is_integer_dtype(series)) \
+                and not is_extension_array_dtype(series):
+            continue
+        with profiling.stage("_convert_column_to_numeric", column):
+            missing_before = series.isna().to_numpy()
 
             # convert
-            df_func[column] = pd.to_numeric(
-                df_func[column].astype(str).
-                str.replace(",", "."), errors='coerce')
+            df_func[column] = _to_numeric(series)
+            missing_after = df_func[column].isna().to_numpy()
 
             # prevent from an entire column with missing value
-            if pd.isna(df_func[column]).all():
+            if not chunk and missing_after.all():
                 raise TypeError(f"Can't convert {column} to numeric.")
 
-            position_after = np.where(df_func[column].isnull())[0]
-            missing.position[column] = list(
-                set(position_after) - set(position_before))
-            number_after = df_func[column].isna().sum()
+            new_missing = missing_after & ~missing_before
+            missing.position[column] = np.flatnonzero(new_missing).tolist()
+            number_before = int(missing_before.sum())
+            number_after = int(missing_after.sum())
             missing.nb[column] = (
                 number_before, number_after, number_after-number_before)
             missing.columns_converted.append(column)
 
             if number_after > number_before:
                 missing.new_missing_columns.append(column)
+                total_new_missing += number_after - number_before
+
+    if not chunk and total_new_missing > 0:
+        # missing values of the whole dataframe, for the feedback
+        after_transforming = int(df_func.isna().sum().sum())
+        _warn_new_missing(missing,
+                          after_transforming - total_new_missing,
+                          after_transforming)
+    return missing
 
-    after_transforming = df_func.isna().sum().sum()
 
+def _warn_new_missing(missing, before_transforming, after_transforming):
+    """ Warn the user when the conversion to numeric created
+    missing values
+    """
     if len(missing.columns_converted) > 0 and \
             before_transforming < after_transforming:
 
@@ -187,7 +246,66 @@ def _convert_column_to_numeric(df_func, column_to_test_func):
               f"value went from {before_transforming} "
               f"to {after_transforming}. print(name_of_your_obj.missing) for "
               "more details.")
-    return missing
+
+
+def _arguments_binder(function):
+    """ Function associating the arguments passed to a decorated
+    function to their name, in the order of its signature.
+
+    The signature is read once. It is only bound (which raises the
+    TypeError of Python for a wrong call) when the arguments can't be
+    associated directly: unknown keyword, too many arguments, an
+    argument passed twice or missing.
+    """
+    function_signature = signature(function)
+    names = list(function_signature.parameters)
+    positional_names = [
+        name for name, parameter in function_signature.parameters.items()
+        if parameter.kind == parameter.POSITIONAL_OR_KEYWORD]
+    keyword_names = set(positional_names) | {
+        name for name, parameter in function_signature.parameters.items()
+        if parameter.kind == parameter.KEYWORD_ONLY}
+    required_names = {
+        name for name, parameter in function_signature.parameters.items()
+        if parameter.default is parameter.empty
+        and parameter.kind in (parameter.POSITIONAL_OR_KEYWORD,
+                               parameter.KEYWORD_ONLY)}
+
+    def bind(args, kwargs) -> dict:
+        if len(args) <= len(positional_names) \
+                and kwargs.keys() <= keyword_names \
+                and kwargs.keys().isdisjoint(positional_names[:len(args)]):
+            passed = dict(zip(positional_names, args))
+            passed.update(kwargs)
+            if passed.keys() >= required_names:
+                return {name: passed[name] for name in names
+                        if name in passed}
+        return function_signature.bind(*args, **kwargs).arguments
+    return bind
+
+
+def _is_polars(data) -> bool:
+    """ True for a Polars dataframe (eager or lazy), without importing
+    Polars when it is not used.
+    """
+    return type(data).__module__.split(".")[0] == "polars" and \
+        type(data).__name__ in ("DataFrame", "LazyFrame")
+
+
+def _array_to_frame(array, column_names=None) -> pd.DataFrame:
+    """ Dataframe of a 1-D or 2-D array (e.g. a np.memmap), without
+    copying it: the columns are views on the array.
+    """
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    elif array.ndim != 2:
+        raise ValueError("Only 1-D and 2-D arrays are supported.")
+    if column_names is None:
+        if array.shape[1] == 1:
+            column_names = ["Tested"]
+        else:
+            column_names = [f"Tested_{j}" for j in range(array.shape[1])]
+    return pd.DataFrame(array, columns=list(column_names), copy=False)
 
 
 def _check_sample(function):
@@ -196,12 +314,27 @@ def _check_sample(function):
     For parameters pass in the class Sample, there is
     a checking of the arguments passed.
     """
+    bind = _arguments_binder(function)
+
+    @wraps(function)
     def verify_arguments(*args, **kwargs):
         new_kwargs = {}
 
         # to associate the argument from args to the
         # keyword to have only kwargs
-        kwargs = signature(function).bind(*args, **kwargs).arguments
+        kwargs = bind(args, kwargs)
+        if _is_polars(kwargs.get("data")):
+            # avoid a circular import, reader uses utils
+            from otpsy import reader
+
+            # only the needed columns are taken from the Polars dataframe
+            data, columns_to_test, participant_column, polars_frame = \
+                reader.read_polars(kwargs["data"],
+                                   kwargs.get("columns_to_test", ""),
+                                   kwargs.get("participant_column", ""))
+            kwargs.update(data=data, columns_to_test=columns_to_test,
+                          participant_column=participant_column)
+            new_kwargs["polars"] = polars_frame
         kwargs["columns_to_test"] = kwargs.get("columns_to_test", "")
         for key, value in kwargs.items():
             # check dataframe enter
@@ -211,12 +344,23 @@ def _check_sample(function):
                     raise TypeError("The argument entered for df "
                                     "is not supported.")
 
-                if isinstance(value, np.ndarray) or isinstance(value, list):
-                    value = pd.DataFrame(value, columns=["Tested"])
+                if isinstance(value, np.ndarray):
+                    value = _array_to_frame(
+                        value, kwargs.get("column_names"))
+
+                elif isinstance(value, list):
+                    value = pd.DataFrame(value, columns=kwargs.get(
+                        "column_names") or ["Tested"])
 
                 elif isinstance(value, pd.Series):
                     value = value.to_frame()
 
+                else:
+                    # the conversion of the columns to numeric doesn't
+                    # modify the dataframe of the user
+                    with _copy_on_write():
+                        value = value.copy(deep=False)
+
                 new_kwargs["data"] = value
                 df = value
 
@@ -242,7 +386,8 @@ def _check_sample(function):
                         pass
                 else:
                     columns_to_test = _process_column_to_test(df, pre_column)
-                missing = _convert_column_to_numeric(df, columns_to_test)
+                with _copy_on_write():
+                    missing = _convert_column_to_numeric(df, columns_to_test)
                 new_kwargs[key] = columns_to_test
                 new_kwargs["missing"] = missing
 
@@ -275,13 +420,20 @@ def _check_sample(function):
 
 
 def _check_number_entry(function):
-    """ Check the argument pass for the detection of outliers """
-    def verify_arguments(*args, **kwargs):
+    """ Check the argument pass for the detection of outliers
+
+    With profile=True, the stages of the detection are measured and
+    kept in the attribute timings of the object (see profiling.profile).
+    """
+    bind = _arguments_binder(function)
+
+    @wraps(function)
+    def verify_arguments(*args, profile=False, **kwargs):
         new_kwargs = {}
 
         # to associate the argument from args to the
         # keyword to have only kwargs
-        kwargs = signature(function).bind(*args, **kwargs).arguments
+        kwargs = bind(args, kwargs)
 
         for key, value in kwargs.items():
             # check dataframe enter
@@ -297,54 +449,105 @@ def _check_number_entry(function):
                 new_kwargs[key] = _process_distance(value)
 
             elif key == "threshold_included" or key == "filter" or key == "b"\
-                or key == "iteration":
+                or key == "iteration" or key == "approximate" or key == "by"\
+                or key == "n_jobs" or key == "executor":
                 new_kwargs[key] = value
 
 
         # to pass self when it's decorating class
         if "self" in kwargs:
-            func = function(kwargs["self"], **new_kwargs)
-        else:
-            func = function(**new_kwargs)
+            new_kwargs["self"] = kwargs["self"]
+        if not profile:
+            return function(**new_kwargs)
+        with profiling.profile() as timings:
+            with profiling.stage(function.__name__):
+                func = function(**new_kwargs)
+        func.timings = timings
         return func
     return verify_arguments
 
 
-def _select_index(column_to_keep, dict_col) -> list:
-    """Private method to take all value of the dictionnary
-    self.outliers and clean it
+def _process_by(df, by) -> list:
+    """ Name of the columns (or index levels) defining the groups """
+    if isinstance(by, (str, int)):
+        by = [by]
+    if not isinstance(by, list):
+        raise TypeError(f"The type of data {type(by)} "
+                        "is not supported to define groups.")
+    for column in by:
+        if column not in df.columns and column not in df.index.names:
+            raise NameError(f"The column \"{column}\" you enter "
+                            "is not in the dataframe")
+    return by
+
+
+def _group_codes(df, by) -> tuple[np.ndarray, pd.Index]:
+    """ Group of each row (position in the sorted groups, -1 if a
+    key is missing) and the groups.
     """
-    # remove list in the list
-    # column to keep is for a specific function
-    index_to_select = [
-        index for key, value in dict_col.items()
-        for index in value if key in column_to_keep
-    ]
-    # avoid duplicate
-    index_to_select_clean = list(set(index_to_select))
-    index_to_select_clean.sort()
-    return index_to_select_clean
-
-
-def _parameters_of_the_table(x, aberrant, other_value, outliers, column):
-    """Private method to manage the output of the table of obj.inspect()"""
-    if x.name in outliers[column]:
-        final = x[column] if aberrant == "value" else True
-    else:
-        final = False if other_value == "bool" else x[column]
-    return final
+    grouped = df.groupby(by, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    # rows with a missing key are not in any group
+    codes = np.where(np.isnan(codes), -1, codes).astype(np.int64)
+    return codes, grouped.size().index
+
+
+def _mask_values(series, mask) -> pd.Series:
+    """ Same as series.mask(mask) (flagged values become NaN),
+    without the alignment of pandas for the float columns.
+    """
+    if not (isinstance(series.dtype, np.dtype) and series.dtype.kind == "f"):
+        return series.mask(mask)
+    values = series.to_numpy(copy=True)
+    values[mask] = np.nan
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def _threshold_by_row(threshold_by_group, codes) -> np.ndarray:
+    """ Threshold of the group of each row (NaN without group) """
+    threshold_by_group = np.append(
+        np.asarray(threshold_by_group, dtype=float), np.nan)
+    return threshold_by_group[codes]
+
+
+def _copy_on_write():
+    """ Context in which the copy-on-write of pandas is enabled.
+    It is always enabled since pandas 3.0.
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return nullcontext()
+    return pd.option_context("mode.copy_on_write", True)
 
 
+def _column_batches(df, columns_to_test):
+    """ Split the columns to test in batches of columns whose
+    block (rows x columns) has at most config.MAX_CELLS_BY_BLOCK cells.
+    """
+    size = max(1, config.MAX_CELLS_BY_BLOCK // max(len(df.index), 1))
+    for start in range(0, len(columns_to_test), size):
+        yield columns_to_test[start:start + size]
+
+
+@profiling.profiled("_get_position")
 def _get_position(df, index_to_find, shortname = ""):
-    position_index = []
-    try:
-        for index in index_to_find:
-            position_index.append(df.index.get_loc(index))
-    except KeyError as e:
+    """ Sorted positions (row numbers) of the participants in
+    index_to_find. All the labels are looked up at once. If the index
+    is not unique, every row of a participant is returned.
+    """
+    if isinstance(index_to_find, (str, int)):
+        index_to_find = [index_to_find]
+    index_to_find = pd.Index(list(index_to_find), dtype=object)
+    if df.index.is_unique:
+        position_index = df.index.get_indexer(index_to_find)
+        missing = position_index == -1
+    else:
+        position_index = np.flatnonzero(df.index.isin(index_to_find))
+        missing = ~index_to_find.isin(df.index)
+    if missing.any():
+        index = index_to_find[np.argmax(missing)]
         raise KeyError(f"The index \"{index}\" seems to not"
                        " be in the column refering to participant.")
-    position_index.sort()
-    return position_index
+    return np.unique(position_index).tolist()
 
 
 def _header_add_true(obj):
@@ -373,10 +576,14 @@ def _header_add_true(obj):
 
 
 def _header_add_false(obj):
+    grouped_text = ""
+    if obj.by is not None:
+        grouped_text = f"Grouped by : {', '.join(map(str, obj.by))}\n"
     output_text = f"""\
 Method used : {obj.method}
 Distance used : {obj.distance}
 Column tested : {', '.join(obj.columns_to_test)}
+{grouped_text}\
 Total number of outliers : {len(obj.all_index)}
 Total number of flagged values : {sum(obj.nb.values())}
 {'-'*30}
@@ -410,6 +617,8 @@ def _content_add_true(obj):
             # The user already know the threshold
             elif shortname == "id":
                 pass
+            elif isinstance(obj.threshold[column][shortname][0], pd.Series):
+                output_text += f"{shortname.upper()}: by group ; "
             else:
                 output_text += f"{shortname.upper()}:" \
                     f" low: {round(obj.threshold[column][shortname][0], 2)} / "\
@@ -431,6 +640,11 @@ def _content_add_false(obj):
         if obj.method == "Sn":
             output_text += "Threshold median distance to other " \
                 f"point is {round(obj.threshold[column], 2)}\n\n"
+        elif isinstance(obj.threshold[column][0], pd.Series):
+            # grouped detection, one threshold by group
+            output_text += "Thresholds computed within each of the " \
+                f"{len(obj.threshold[column][0])} groups " \
+                "(see .threshold)\n\n"
         else:
             output_text += "Low threshold : " \
                 f"{round(obj.threshold[column][0], 2)} / "\
@@ -490,10 +704,10 @@ def _s_if_needed(nb):
     return output_text
 
 
-def _concat_both_object(new_obj, obj1, obj2):
+def _concat_objects(new_obj, to_concat):
     """
     # ! Private Function !
-    Used to concat obj1 and obj2 to return a new obj. Basically,
+    Used to concat all the objects of to_concat in new_obj. Basically,
     the concatenation corresponds to the update of the different
     attributes and put this attribute into a Method-Multi object.
 
@@ -502,11 +716,8 @@ def _concat_both_object(new_obj, obj1, obj2):
     new_obj : main.MethodMulti
         The statistical object to be updated.
         
-    obj1 : child of main._Outliers
-        The first outliers object to be concatenated.
-        
-    obj2 : child of main._Outliers
-        The second outliers object to be concatenated.
+    to_concat : list of child of main._Outliers
+        The outliers objects to be concatenated, in order.
 
     Returns
     -------
@@ -515,83 +726,81 @@ def _concat_both_object(new_obj, obj1, obj2):
 
     Notes
     -----
-    The function _update_the_attribute takes two outliers objects
-    (obj1 and obj2) and a target object (new_obj) as input.
-    It standardizes the format of the input objects, concatenates
-    their information by updating the attributes of the target
-    object accordingly. The updates include combining methods,
-    distances, thresholds, columns to test with associated methods,
-    and the number of outliers associated with specific columns.
-    Finally, it returns the updated target object (new_obj).
+    Each object is read once. Simple objects are formatted on a
+    shallow copy (the dataframe and the flags are not copied) and the
+    attributes of new_obj are new containers, so the objects to
+    concatenate are never modified. The flagged values of a column
+    present in several objects are merged with a union of the boolean
+    masks. When an object shares the participants (same index) of
+    new_obj, its masks are used directly, otherwise the participants
+    are looked up in the dataframe of new_obj.
+    For the first object, every flagged column is kept. For the
+    following objects, only the columns to test are added (as was
+    done when the objects were concatenated two by two).
     """
-    
-    # Make all the parameter in the good format
-    if obj1.multi == False: 
-        obj1_cleaned = _change_format_of_attribute(deepcopy(obj1))
-    else:
-        obj1_cleaned = deepcopy(obj1)
-    
-    if obj2.multi == False:
-        obj2_cleaned = _change_format_of_attribute(deepcopy(obj2))
-    else:
-        obj2_cleaned = deepcopy(obj2)
-
-    # Concat the two elements here
-    
-    ## Update of the method
-    new_obj.method = obj1_cleaned.method + obj2_cleaned.method
-
-    ## Update of the distance
-    new_obj.distance = obj1_cleaned.distance
-    
-    ### obj.distance = {Distance: shortname}
-    for key2, value2 in obj2_cleaned.distance.items():
-        # avoid duplicate
-        new_obj.distance.setdefault(key2, []).extend(value2)
-        new_obj.distance[key2] = list(set(new_obj.distance[key2]))
-
-
-    # Update threshold and the column associated with the method
-    new_obj.columns_to_test_w_method = \
-        obj1_cleaned.columns_to_test_w_method
-    
-    new_obj.threshold = obj1_cleaned.threshold
-    # columns_to_test_w_method = {Column: method}
-    # threshold = {Column: {shortname: threshold}}
-    for column in obj2_cleaned.columns_to_test:
-        # add method to each
-        new_obj.columns_to_test_w_method.setdefault(column, []).\
-            extend(obj2_cleaned.shortname)
-        
-        # It is not possible to add two object of the same method
-        # Anyway, it makes no sense.
-        threshold_merge = obj1_cleaned.threshold.get(column, {}) | \
-            obj2_cleaned.threshold[column]
-        new_obj.threshold.setdefault(column, {}).update(threshold_merge)
-
-    # Add column to test associated with columns to test
-    new_obj.columns_to_test = list(
-        set(obj1_cleaned.columns_to_test 
-            + obj2_cleaned.columns_to_test
-    ))
-
-    # Add number of outliers associated to a specific column and
-    # avoid duplicate in outliers
-    new_obj.dict_col = obj1_cleaned.dict_col
-    for column in obj2_cleaned.columns_to_test:
-        new_obj.dict_col.setdefault(column, []).extend(
-            obj2_cleaned.dict_col[column])
-        new_obj.dict_col[column] = list(set(
-            new_obj.dict_col[column]
-        ))
-    for column in new_obj.columns_to_test:
-        new_obj.nb[column] = len(new_obj.dict_col[column])
-        new_obj.position[column] = _get_position(new_obj.df, 
-                                                 new_obj.dict_col[column])
-
-    new_obj.all_index = _select_index(
-        new_obj.dict_col.keys(), new_obj.dict_col)
-    
+    index = new_obj.df.index
+    masks = {}
+    for i, obj in enumerate(to_concat):
+        # Make all the parameter in the good format
+        if obj.multi == False:
+            obj = _change_format_of_attribute(copy(obj))
+
+        ## Update of the method
+        new_obj.method.extend(obj.method)
+
+        ## Update of the distance
+        ### obj.distance = {Distance: shortname}
+        for distance, shortnames in obj.distance.items():
+            # avoid duplicate
+            new_obj.distance[distance] = list(dict.fromkeys(
+                new_obj.distance.get(distance, []) + list(shortnames)))
+
+        # Update threshold and the column associated with the method
+        # columns_to_test_w_method = {Column: method}
+        # threshold = {Column: {shortname: threshold}}
+        if i == 0:
+            new_obj.columns_to_test_w_method = {
+                column: list(methods) for column, methods
+                in obj.columns_to_test_w_method.items()}
+            new_obj.threshold = {
+                column: dict(thresholds) for column, thresholds
+                in obj.threshold.items()}
+        else:
+            for column in obj.columns_to_test:
+                # add method to each
+                new_obj.columns_to_test_w_method.setdefault(
+                    column, []).extend(obj.shortname)
+                # It is not possible to add two object of the same
+                # method. Anyway, it makes no sense.
+                new_obj.threshold.setdefault(column, {}).update(
+                    obj.threshold[column])
+
+        # Add column to test associated with columns to test
+        new_obj.columns_to_test.extend(obj.columns_to_test)
+
+        # Add outliers associated to a specific column. A participant
+        # present in several objects is only flagged once.
+        columns = obj._flags.columns if i == 0 else obj.columns_to_test
+        same_rows = obj.df.index is index or (
+            index.is_unique and obj.df.index.equals(index))
+        for column in columns:
+            if same_rows:
+                mask = obj._flags.column(column)
+            else:
+                mask = np.zeros(len(index), dtype=bool)
+                mask[_get_position(new_obj.df, obj.df.index[
+                    obj._flags.column(column)].tolist())] = True
+            if column in masks:
+                masks[column] |= mask
+            else:
+                masks[column] = mask
+
+    new_obj.columns_to_test = list(dict.fromkeys(new_obj.columns_to_test))
+    new_obj._flags = flags.FlagMatrix(len(index), list(masks))
+    if len(masks) > 0:
+        new_obj._flags.set_columns(list(masks),
+                                   np.column_stack(list(masks.values())))
+    new_obj._flags = new_obj._flags.compacted()
     return new_obj
 
 
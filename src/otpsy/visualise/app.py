@@ -178,98 +178,104 @@ def main(df, column_to_vis):
         Input(component_id="graph", component_property='value')
     )
     def update_graph(y, method, method_2, distance, graph_type):
-        # allow to know which subplot corresponds to the method
-        ref = {}
-        max_frequency = {}
+        return figure(df, y, method, method_2, distance, graph_type)
+    app.run(jupyter_mode="external") # avoid to open in non user friendly way in jupyter
+    
 
-        # deal with the fact that there are two checklist
-        if method == None:
-            method = list()
-        if method_2 == None:
-            method_2 = list()
-        method.extend(method_2)
-        
-        if y == None or len(y) == 0:
-            fig = px.scatter({'data': []})
-            # number_of_subplots = 1 because the value of number_of_subplots 
-            # is used to increase the height of figure containing the subplot.
-            # I increase the height of figure for each subplot added
-            # with : height = height_of_a_subplot * number_of_subplots. 
-            # However, if there is no column to show (y == none), the 
-            # number of subplot should be 0. But, the height of the figure
-            # can't be 0. Thus, number_of_subplot = 1 even there is no plot.
-            number_of_subplots = 1
-        elif graph_type == "Scatter":
-            title_of_subplots = [f"Scatter plot of {col}" for col in y]
-            fig = make_subplots(rows=len(y), 
-                                cols= 1, 
-                                subplot_titles=title_of_subplots,
-                                vertical_spacing=0.12)
-            # Add subplot for each column to show
-            for i, column in enumerate(y):
-                fig.add_trace(
-                    go.Scatter(
-                        x=df.reset_index().index, 
-                        y=df[column],
-                        hovertemplate= f'Index: %{{text}}<extra></extra><br>' \
-                                    f'Row number: %{{x}}<br>{column}: %{{y}}<br>',
-                        text=df.index,
-                        mode="markers",
-                        xaxis=f"x{i+1}",
-                        yaxis=f"y{i+1}"),
-                        row=i+1, col=1)
-                fig.update_xaxes(title="Row Number")
-                fig.update_yaxes(title=column)
-                ref[column] = i + 1
-            
-            # Update the threshold to see (2, 2.5 or 3)
-            fig = update_distance_show(df, fig, method, y, distance, ref, graph_type, "")
+def figure(df, y, method, method_2, distance, graph_type):
+    """Figure of the dashboard for the selected columns, methods,
+    distances and type of graph (used by the callback of main)"""
+    # allow to know which subplot corresponds to the method
+    ref = {}
+    max_frequency = {}
 
-            # Used for the height of the figure
-            number_of_subplots = i + 1
+    # deal with the fact that there are two checklist
+    if method == None:
+        method = list()
+    if method_2 == None:
+        method_2 = list()
+    method.extend(method_2)
+    
+    if y == None or len(y) == 0:
+        fig = px.scatter({'data': []})
+        # number_of_subplots = 1 because the value of number_of_subplots 
+        # is used to increase the height of figure containing the subplot.
+        # I increase the height of figure for each subplot added
+        # with : height = height_of_a_subplot * number_of_subplots. 
+        # However, if there is no column to show (y == none), the 
+        # number of subplot should be 0. But, the height of the figure
+        # can't be 0. Thus, number_of_subplot = 1 even there is no plot.
+        number_of_subplots = 1
+    elif graph_type == "Scatter":
+        title_of_subplots = [f"Scatter plot of {col}" for col in y]
+        fig = make_subplots(rows=len(y), 
+                            cols= 1, 
+                            subplot_titles=title_of_subplots,
+                            vertical_spacing=0.12)
+        # Add subplot for each column to show
+        for i, column in enumerate(y):
+            fig.add_trace(
+                go.Scatter(
+                    x=df.reset_index().index, 
+                    y=df[column],
+                    hovertemplate= f'Index: %{{text}}<extra></extra><br>' \
+                                f'Row number: %{{x}}<br>{column}: %{{y}}<br>',
+                    text=df.index,
+                    mode="markers",
+                    xaxis=f"x{i+1}",
+                    yaxis=f"y{i+1}"),
+                    row=i+1, col=1)
+            fig.update_xaxes(title="Row Number")
+            fig.update_yaxes(title=column)
+            ref[column] = i + 1
         
-        elif graph_type == "Histogram":
-            title_of_subplots = [f"Histogram plot of {col}" for col in y]
-            fig = make_subplots(rows=len(y), 
-                                cols= 1, 
-                                subplot_titles=title_of_subplots,
-                                vertical_spacing=0.12)
-            for i, column in enumerate(y):
-                # Get the maximum height bins to know the height 
-                # of the threshold
-                max_frequency_for_a_bin = get_max_occ_bin(df, column)
-                fig.add_trace(
-                    go.Histogram(
-                        x=df[column],
-                        xaxis=f"x{i+1}",
-                        yaxis=f"y{i+1}",
-                        hovertemplate='<i>Bin-range</i>: %{x}'\
-                                      '<br><i>Count</i>: %{y} <extra></extra>',
-                        marker=dict(line=dict(width=0.8,
-                                    color="white"))),                       
-                    row=i+1, col=1,
-                )
-                fig.update_xaxes(title=column)
-                fig.update_yaxes(title="Count")
-                ref[column] = i + 1
-                max_frequency[column] = max_frequency_for_a_bin
-            
-            fig = update_distance_show(df, fig, method, y, distance, ref, graph_type, max_frequency)
+        # Update the threshold to see (2, 2.5 or 3)
+        fig = update_distance_show(df, fig, method, y, distance, ref, graph_type, "")
 
-            number_of_subplots = i + 1
-        height_of_one_plot = 400
+        # Used for the height of the figure
+        number_of_subplots = i + 1
+    
+    elif graph_type == "Histogram":
+        title_of_subplots = [f"Histogram plot of {col}" for col in y]
+        fig = make_subplots(rows=len(y), 
+                            cols= 1, 
+                            subplot_titles=title_of_subplots,
+                            vertical_spacing=0.12)
+        for i, column in enumerate(y):
+            # Get the maximum height bins to know the height 
+            # of the threshold
+            max_frequency_for_a_bin = get_max_occ_bin(df, column)
+            fig.add_trace(
+                go.Histogram(
+                    x=df[column],
+                    xaxis=f"x{i+1}",
+                    yaxis=f"y{i+1}",
+                    hovertemplate='<i>Bin-range</i>: %{x}'\
+                                  '<br><i>Count</i>: %{y} <extra></extra>',
+                    marker=dict(line=dict(width=0.8,
+                                color="white"))),                       
+                row=i+1, col=1,
+            )
+            fig.update_xaxes(title=column)
+            fig.update_yaxes(title="Count")
+            ref[column] = i + 1
+            max_frequency[column] = max_frequency_for_a_bin
         
-        fig.update_layout(
-            height = height_of_one_plot*number_of_subplots,
-            width = 900,
-            margin=dict(l=30, r=30, t=30, b=20),
-            showlegend = False,
-            paper_bgcolor = 'rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)'
-        )
-        return fig
-    app.run(jupyter_mode="external") # avoid to open in non user friendly way in jupyter
+        fig = update_distance_show(df, fig, method, y, distance, ref, graph_type, max_frequency)
+
+        number_of_subplots = i + 1
+    height_of_one_plot = 400
     
+    fig.update_layout(
+        height = height_of_one_plot*number_of_subplots,
+        width = 900,
+        margin=dict(l=30, r=30, t=30, b=20),
+        showlegend = False,
+        paper_bgcolor = 'rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
 
 def get_max_occ_bin(df, column):
     """Get the maximum height of a bin in an histogram"""
@@ -0,0 +1,37 @@
+# It is important to run "pip install -e ." before running test
+
+import pandas as pd
+import numpy as np
+import pytest
+import otpsy as ot
+
+df = pd.read_csv("./tests/data.csv", sep=";")
+class TestClass:
+    sample = ot.Sample(df,
+                       columns_to_test=["art_looking_time", "discrimination_performance"],
+                       participant_column="index_participant")
+    outliers_sd = sample.method_SD(distance=1.5)
+    outliers_iqr = sample.method_IQR()
+    outliers_mad = ot.Sample(df, columns_to_test="age",
+                             participant_column="index_participant").method_MAD()
+
+    def test_concat(self):
+        dict_col_sd = self.outliers_sd.dict_col
+        concatenated = ot.concat([self.outliers_sd, self.outliers_iqr, self.outliers_mad])
+        # the flags of a column present in several objects are merged
+        assert(concatenated.dict_col == dict_col_sd | self.outliers_mad.dict_col)
+        assert(concatenated.method == ["Standard Deviation", "Inter-quartile range", "Median Absolute Distance"])
+        assert(concatenated.columns_to_test_w_method["art_looking_time"] == ["sd", "iqr"])
+        # the objects are not modified and the dataframe is not copied
+        assert(self.outliers_sd.dict_col == dict_col_sd)
+        assert(self.outliers_sd.method == "Standard Deviation")
+        assert(concatenated.df is self.outliers_sd.df)
+
+    def test_concat_nested(self):
+        concatenated = ot.concat([self.outliers_sd, self.outliers_iqr, self.outliers_mad])
+        nested = ot.concat([ot.concat([self.outliers_sd, self.outliers_iqr]), self.outliers_mad])
+        assert(nested.dict_col == concatenated.dict_col)
+
+    def test_concat_error(self):
+        with pytest.raises(ValueError):
+            ot.concat([self.outliers_sd, df])
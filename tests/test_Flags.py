@@ -0,0 +1,72 @@
+# It is important to run "pip install -e ." before running test
+
+import sys
+import pandas as pd
+import pytest
+import otpsy as ot
+
+df = pd.read_csv("./tests/data.csv", sep=";")
+
+
+def assert_same_outliers(first, second):
+    """ The views of two outliers objects are the same """
+    assert(first.dict_col == second.dict_col)
+    assert(first.nb == second.nb)
+    assert(first.position == second.position)
+    assert(first.all_index == second.all_index)
+
+
+class TestClass:
+    sample = ot.Sample(df,
+                       columns_to_test=["art_looking_time", "discrimination_performance"],
+                       participant_column="index_participant")
+
+    def test_packed_flags(self, monkeypatch):
+        # the views have to be the same when flags are bit-packed
+        monkeypatch.setattr(ot.config, "FLAG_PACKING_THRESHOLD", 0)
+        packed = self.sample.method_SD(distance=1.5, threshold_included=True)
+        monkeypatch.undo()
+        unpacked = self.sample.method_SD(distance=1.5, threshold_included=True)
+        assert(packed._flags.packed and not unpacked._flags.packed)
+        assert_same_outliers(packed, unpacked)
+
+    def test_sparse_flags(self, monkeypatch):
+        # the views have to be the same when only the flagged positions are stored
+        monkeypatch.setattr(ot.config, "FLAG_SPARSE_MIN_COLUMNS", 1)
+        sparse = self.sample.method_SD(distance=1.5)
+        sparse.add("P1")
+        monkeypatch.undo()
+        dense = self.sample.method_SD(distance=1.5)
+        dense.add("P1")
+        assert(isinstance(sparse._flags, ot.flags.SparseFlagMatrix))
+        assert(not isinstance(dense._flags, ot.flags.SparseFlagMatrix))
+        assert_same_outliers(sparse, dense)
+        assert(sparse.flagged_columns("P37") == dense.flagged_columns("P37") == ["art_looking_time", "discrimination_performance"])
+        assert(sparse.flagged_columns("P1") == ["added_manually"])
+        pd.testing.assert_frame_equal(sparse.sparse_flags(), dense.sparse_flags())
+        assert(sparse.sparse_flags().sparse.to_dense().sum().to_dict() == dense.nb)
+        pd.testing.assert_frame_equal(sparse.manage("delete"), dense.manage("delete"))
+        pd.testing.assert_frame_equal(sparse.manage("na"), dense.manage("na"))
+
+    def test_sparse_flags_storage(self, monkeypatch):
+        monkeypatch.setattr(ot.config, "FLAG_SPARSE_MIN_COLUMNS", 1)
+        # with many flagged values, the boolean matrix takes less memory
+        many = self.sample.method_SD(distance=0.1)
+        few = self.sample.method_SD(distance=2)
+        assert(not isinstance(many._flags, ot.flags.SparseFlagMatrix))
+        assert(isinstance(few._flags, ot.flags.SparseFlagMatrix))
+        # without the private module of pandas, the columns are built from masks
+        expected = few.sparse_flags()
+        monkeypatch.setitem(sys.modules, "pandas._libs.sparse", None)
+        pd.testing.assert_frame_equal(few.sparse_flags(), expected)
+
+    def test_added_manually_order(self):
+        # participants added manually are sorted by index,
+        # not by row as the flagged values
+        outliers = self.sample.method_SD(distance=2.4)
+        outliers.add(["P8", "P12", "P3"])
+        outliers.add("P20")
+        assert(outliers.dict_col["added_manually"] == ["P12", "P20", "P3", "P8"])
+        assert(outliers.position["added_manually"] == [2, 7, 11, 19])
+        outliers.remove("P12")
+        assert(outliers.dict_col["added_manually"] == ["P20", "P3", "P8"])
@@ -0,0 +1,14 @@
+# It is important to run "pip install -e ." before running test.
+
+import subprocess
+import sys
+
+
+def test_visualisation_not_loaded_on_import():
+    # dash and plotly have to be loaded only by Sample.visualise
+    code = ("import sys, otpsy; "
+            "print([m for m in ('dash', 'plotly', 'otpsy.visualise.app') "
+            "if m in sys.modules])")
+    output = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, check=True)
+    assert(output.stdout.strip() == "[]")
@@ -0,0 +1,31 @@
+# It is important to run "pip install -e ." before running test
+
+import pandas as pd
+import numpy as np
+import pytest
+import otpsy as ot
+
+df = pd.read_csv("./tests/data.csv", sep=";")
+class TestClass:
+    sample = ot.Sample(df,
+                       columns_to_test=["art_looking_time", "likert1"],
+                       participant_column="index_participant")
+
+    def test_manage_winsorise(self):
+        outliers = self.sample.method_SD(distance=1.5)
+        df_winsorised = outliers.manage(method="winsorise")
+        # the column which is not managed is not copied
+        assert(np.shares_memory(df_winsorised["age"].to_numpy(),
+                                outliers.df["age"].to_numpy()))
+        # integer columns are clipped too
+        assert(df_winsorised["likert1"].max() ==
+               outliers.threshold["likert1"][1])
+
+    def test_manage_inplace(self):
+        outliers = self.sample.method_SD(distance=1.5)
+        nb_row = len(outliers.df.index) - len(outliers.all_index)
+        assert(outliers.manage(method="delete", inplace=True) is None)
+        assert(len(outliers.df.index) == nb_row)
+        assert(outliers.all_index == [])
+        # the dataframe of the sample is not modified
+        assert(len(self.sample.df.index) == 60)
@@ -80,3 +80,97 @@ class TestClass:
 
         df3 = self.outliers.manage(method = "na")
         assert(np.isnan(df3.loc["P11", "art_looking_time"]))
+
+
+    def test_compute_thresholds(self):
+        columns = ["art_looking_time", "discrimination_performance"]
+        df_test = self.sample_columns_to_test_p_col.df
+        low, high = ot.compute_thresholds(df_test, columns, "iqr", 2.4)
+        for j, column in enumerate(columns):
+            assert((low[j], high[j]) ==
+                   ot.threshold_iqr(df_test, [column], 2.4))
+
+    def test_inspect_method(self):
+        outliers = self.sample_columns_to_test_p_col.method_IQR(
+            distance=2.4, threshold_included=True)
+        table = outliers.inspect()
+        assert(list(table.index) == ["P10", "P11", "P37"])
+        assert(list(table.columns) ==
+               ["art_looking_time", "discrimination_performance"])
+        assert(table.loc["P37", "art_looking_time"] == False)
+        assert(table.loc["P37", "discrimination_performance"] ==
+               self.sample_columns_to_test_p_col.df.loc[
+                   "P37", "discrimination_performance"])
+
+        table_bool = outliers.inspect(aberrant_format="bool",
+                                      all_participants=True)
+        assert(len(table_bool.index) == 60)
+        assert(table_bool.to_numpy().sum() == 3)
+
+        table_all = outliers.inspect(other_value="value", all_columns=True)
+        assert(list(table_all.columns) ==
+               list(self.sample_columns_to_test_p_col.df.columns))
+
+    def test_add_unknown_participant(self):
+        outliers = self.sample_columns_to_test_p_col.method_IQR()
+        with pytest.raises(KeyError, match="P1000"):
+            outliers.add(["P8", "P1000"])
+
+    def test_add_non_unique_index(self):
+        # every row of a participant is flagged
+        df_repeated = pd.concat([df, df])
+        sample = ot.Sample(df_repeated,
+                           columns_to_test=["art_looking_time"],
+                           participant_column="index_participant")
+        outliers = sample.method_IQR()
+        outliers.add("P8")
+        assert(outliers.position["added_manually"] == [7, 67])
+
+    def test_remove_dict(self):
+        outliers = self.sample_columns_to_test_p_col.method_IQR(distance=1)
+        flagged = outliers.dict_col["art_looking_time"]
+        outliers.remove({"art_looking_time": flagged[0]})
+        assert(outliers.dict_col["art_looking_time"] == flagged[1:])
+        with pytest.raises(KeyError):
+            outliers.remove({"unknown_column": flagged[0]})
+        with pytest.raises(TypeError):
+            outliers.remove(2.5)
+
+    def test_approximate_thresholds(self):
+        # below k values, the sketch keeps every value
+        approximate = self.sample_columns_to_test_p_col.method_IQR(
+            distance=2.4, threshold_included=True, approximate=True)
+        assert(approximate.threshold == self.outliers.threshold)
+
+        # sketches built by chunk and merged
+        values = np.random.default_rng(0).normal(size=100_000)
+        sketches = [ot.QuantileSketch.from_values(chunk, seed=0)
+                    for chunk in np.array_split(values, 4)]
+        for sketch in sketches[1:]:
+            sketches[0].merge(sketch)
+        q1, q3 = sketches[0].quantile([0.25, 0.75])
+        rank = np.searchsorted(np.sort(values), [q1, q3]) / len(values)
+        assert(np.all(np.abs(rank - [0.25, 0.75]) < sketches[0].rank_error))
+        low, high = ot.thresholds_from_sketches(sketches[:1], "tukey", 1.5)
+        assert(np.allclose([low[0], high[0]],
+                           [q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)]))
+
+    def test_grouped_detection(self):
+        # same thresholds and outliers as a sample by group
+        outliers = self.sample_columns_to_test_p_col.method_IQR(by="gender")
+        for gender, df_group in df.groupby("gender"):
+            outliers_group = ot.Sample(
+                df_group,
+                columns_to_test=["art_looking_time",
+                                 "discrimination_performance"],
+                participant_column="index_participant").method_IQR()
+            for column in outliers_group.threshold:
+                low, high = outliers.threshold[column]
+                assert((low[gender], high[gender]) ==
+                       outliers_group.threshold[column])
+                assert([index for index in outliers.dict_col[column]
+                        if index in outliers_group.df.index] ==
+                       outliers_group.dict_col[column])
+        with pytest.raises(ValueError):
+            self.sample_columns_to_test_p_col.method_IQR(
+                by="gender", approximate=True)
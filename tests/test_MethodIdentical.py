@@ -76,3 +76,18 @@ class TestClass:
 
         df3 = self.outliers.manage(method = "na")
         assert(np.isnan(df3.loc["P6", "likert1"]))
+
+
+    def test_max_frequency(self):
+        columns = ['likert1', 'likert2', 'likert3', 'likert4']
+        df_test = self.sample_columns_to_test_p_col.df[columns].copy()
+        df_test.iloc[[0, 5, 9], [1, 2]] = np.nan
+        df_test.iloc[3, :] = np.nan
+        expected = df_test.apply(
+            lambda x: x.value_counts(), axis=1).max(axis=1).div(4)
+        # small integers
+        assert(np.array_equal(ot.threshold_identical(df_test, columns),
+                              expected, equal_nan=True))
+        # other values
+        assert(np.array_equal(ot.threshold_identical(df_test + 0.5, columns),
+                              expected, equal_nan=True))
@@ -79,4 +79,40 @@ class TestClass:
         assert(df2.loc["P11", "art_looking_time"] == self.outliers.threshold["art_looking_time"][0])
 
         df3 = self.outliers.manage(method = "na")
-        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
\ No newline at end of file
+        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
+    def test_statistics_cache(self, monkeypatch):
+        sample = ot.Sample(df.copy(),
+                           columns_to_test=["art_looking_time", "likert1"],
+                           participant_column="index_participant")
+        sample.method_MAD(distance=2.4)
+        # the statistics are not computed again for another distance
+        computed = []
+        block_statistics = ot.threshold._block_statistics
+        monkeypatch.setattr(ot.threshold, "_block_statistics",
+                            lambda *args: computed.append(args)
+                            or block_statistics(*args))
+        sample.method_MAD(distance=3)
+        assert(computed == [])
+
+        # only the modified column is computed again
+        sample.df.loc["P1", "art_looking_time"] = 10_000
+        outliers = sample.method_MAD(distance=2.4)
+        assert(len(computed) == 1 and computed[0][0].shape[1] == 1)
+        assert("P1" in outliers.dict_col["art_looking_time"])
+        assert(sample.statistics().loc["art_looking_time", "median"] ==
+               sample.df["art_looking_time"].median())
+
+    def test_missing_values(self):
+        df_missing = df.copy()
+        df_missing.loc[::4, "art_looking_time"] = np.nan
+        df_missing.loc[1::7, "likert1"] = np.nan
+        sample = ot.Sample(df_missing,
+                           columns_to_test=["art_looking_time", "likert1"],
+                           participant_column="index_participant")
+        outliers = sample.method_MAD(distance=2.4)
+        # same thresholds as np.nanmedian computed column by column
+        for column in ["art_looking_time", "likert1"]:
+            median = np.nanmedian(sample.df[column])
+            mad = ot.mathematics.compute_mad(sample.df, column, median, 1.4826)
+            assert(outliers.threshold[column] ==
+                   (median - 2.4*mad, median + 2.4*mad))
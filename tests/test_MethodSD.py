@@ -78,4 +78,4 @@ class TestClass:
         assert(df2.loc["P11", "art_looking_time"] == self.outliers.threshold["art_looking_time"][0])
 
         df3 = self.outliers.manage(method = "na")
-        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
\ No newline at end of file
+        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
@@ -80,4 +80,39 @@ class TestClass:
         # assert(df2.loc["P11", "art_looking_time"] == self.outliers.threshold["art_looking_time"][0])
 
         df3 = self.outliers.manage(method = "na")
-        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
\ No newline at end of file
+        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
+
+    def test_fast_sn_equals_reference(self):
+        for column in ["art_looking_time", "discrimination_performance"]:
+            df_test = self.sample_columns_to_test_p_col.df
+            Sn_fast, all_median_fast = ot.S_n(df_test, column)
+            Sn_ref, all_median_ref = ot.S_n_reference(df_test, column)
+            assert(Sn_fast == Sn_ref)
+            assert(np.array_equal(all_median_fast.to_numpy(),
+                                  all_median_ref.to_numpy(dtype=float),
+                                  equal_nan=True))
+
+        # ties and missing values
+        df_ties = pd.DataFrame({"col": [1, 2, 2, np.nan, 3, 3, 3, 8, 1, 2]})
+        Sn_fast, all_median_fast = ot.S_n(df_ties, "col")
+        Sn_ref, all_median_ref = ot.S_n_reference(df_ties, "col")
+        assert(Sn_fast == Sn_ref)
+        assert(np.array_equal(all_median_fast.to_numpy(),
+                              all_median_ref.to_numpy(dtype=float),
+                              equal_nan=True))
+
+    def test_parallel_columns(self):
+        sample = ot.Sample(df, 
+                    columns_to_test=["art_looking_time", "discrimination_performance", "likert1"], 
+                    participant_column="index_participant")
+        serial_sn = sample.method_Sn()
+        serial_rsd = sample.method_rSD(iteration=5)
+        for executor in ["thread", "process"]:
+            parallel_sn = sample.method_Sn(n_jobs=2, executor=executor)
+            parallel_rsd = sample.method_rSD(iteration=5, n_jobs=2, executor=executor)
+            assert(list(parallel_sn.dict_col.items()) == list(serial_sn.dict_col.items()))
+            assert(parallel_sn.threshold == serial_sn.threshold)
+            assert(list(parallel_rsd.dict_col.items()) == list(serial_rsd.dict_col.items()))
+            assert(parallel_rsd.threshold == serial_rsd.threshold)
+        with pytest.raises(ValueError):
+            sample.method_Sn(n_jobs=2, executor="gpu")
@@ -78,4 +78,21 @@ class TestClass:
         assert(df2.loc["P11", "art_looking_time"] == self.outliers.threshold["art_looking_time"][0])
 
         df3 = self.outliers.manage(method = "na")
-        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
\ No newline at end of file
+        assert(np.isnan(df3.loc["P11", "art_looking_time"]))
+
+    def test_recursive_sd_without_copy(self):
+        # compare with the naive loop on the kept values
+        values = df["art_looking_time"].to_numpy(dtype=float)
+        kept = values.copy()
+        for iteration in range(1, 10):
+            low = round(np.nanmean(kept) - 2 * np.nanstd(kept), 3)
+            high = round(np.nanmean(kept) + 2 * np.nanstd(kept), 3)
+            new_kept = kept[(kept >= low) & (kept <= high)]
+            if len(new_kept) == len(kept):
+                break
+            kept = new_kept
+        low_threshold, high_threshold, flagged, n_iteration = \
+            ot.recursive_sd(values, 2, 10)
+        assert((low_threshold, high_threshold) == (low, high))
+        assert(n_iteration == iteration)
+        assert((flagged == ((values < low) | (values > high))).all())
@@ -0,0 +1,40 @@
+# It is important to run "pip install -e ." before running test
+
+import threading
+import pandas as pd
+import numpy as np
+import pytest
+import otpsy as ot
+
+df = pd.read_csv("./tests/data.csv", sep=";")
+class TestClass:
+    sample = ot.Sample(df,
+                       columns_to_test=["art_looking_time", "discrimination_performance"],
+                       participant_column="index_participant")
+
+    def test_profile_method(self):
+        outliers = self.sample.method_SD(profile=True)
+        timings = outliers.timings.to_dataframe()
+        assert(list(timings["stage"]) == ["method_SD", "numeric_block", "threshold", "mask"])
+        assert((timings["calls"] == 1).all())
+        assert((timings["peak_memory_bytes"] > 0).all())
+        # off by default
+        not_profiled = self.sample.method_SD()
+        assert(not_profiled.timings is None)
+        assert(outliers.dict_col == not_profiled.dict_col)
+
+    def test_profile_context(self):
+        outliers = self.sample.method_SD()
+        with ot.profile(memory=False) as timings:
+            outliers.add("P1")
+            outliers.manage("delete")
+        assert(list(timings.to_dataframe()["stage"]) == ["_get_position", "manage"])
+
+    def test_profile_thread(self):
+        # the stages run in another thread are not measured
+        thread = threading.Thread(target=self.sample.method_SD)
+        with ot.profile(memory=False) as timings:
+            thread.start()
+            thread.join()
+            self.sample.method_IQR()
+        assert((timings.to_dataframe()["calls"] == 1).all())
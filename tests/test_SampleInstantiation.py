@@ -1,5 +1,7 @@
 import pandas as pd
 import os 
+import inspect
+import numpy as np
 import pytest
 df = pd.read_csv("./tests/data.csv", sep=";")
 
@@ -31,4 +33,143 @@ class TestClass:
         sample_columns_to_test_p_col = \
             ot.Sample(df, columns_to_test=["age", "random_col"], participant_column=1)
 
+    def test_sample_from_csv(self, df, tmp_path):
+        df_file = df.copy()
+        df_file["age"] = df_file["age"].astype(str)
+        df_file.loc[45, "age"] = "not answered"
+        df_file.loc[50, "age"] = "26,5"
+        df_file.to_csv(tmp_path / "data.csv", sep=";", index=False)
+
+        sample_csv = ot.Sample.from_csv(
+            tmp_path / "data.csv", columns_to_test=["age", "random_col"],
+            participant_column="index_participant", chunksize=7, sep=";")
+        sample = ot.Sample(df_file, columns_to_test=["age", "random_col"],
+                           participant_column="index_participant")
+        assert(list(sample_csv.df.columns) == ["age", "random_col"])
+        assert(sample_csv.df.loc["P51", "age"] == 26.5)
+        pd.testing.assert_frame_equal(
+            sample_csv.df, sample.df[["age", "random_col"]])
+        assert(sample_csv.missing.position == {"age": [45]})
+        assert(sample_csv.method_IQR(distance=1).dict_col ==
+               sample.method_IQR(distance=1).dict_col)
+
+    def test_sample_from_csv_approximate(self, df, tmp_path):
+        df.to_csv(tmp_path / "data.csv", sep=";", index=False)
+        columns = ["age", "art_looking_time"]
+        sample = ot.Sample.from_csv(tmp_path / "data.csv", columns, "index_participant",
+                                    chunksize=7, approximate=True, sep=";")
+        # the sketches built while reading are used by the approximate thresholds
+        sketches = ot.cache.summary_statistics(sample.df).sketches(columns)
+        assert([column_sketch.n for column_sketch in sketches] ==
+               sample.df[columns].count().tolist())
+        low, high = ot.thresholds_from_sketches(sketches, "iqr", 2)
+        outliers = sample.method_IQR(approximate=True)
+        assert(outliers.threshold == {column: (low[j], high[j]) for j, column in enumerate(columns)})
+        assert(sample.method_MAD(approximate=True).dict_col == sample.method_MAD().dict_col)
+        # a modified column is not approximated with its old sketch
+        sample.df["age"] = sample.df["age"] * 2
+        assert(ot.cache.summary_statistics(sample.df).sketches(columns) is None)
+
+    def test_convert_column_to_numeric(self, df):
+        df_types = df[["index_participant", "likert1"]].copy()
+        df_types["answered"] = df["age"] > 30
+        df_types["age"] = df["age"].astype(str).str.replace(".", ",")
+        df_types.loc[3, "age"] = "not answered"
+        sample = ot.Sample(df_types, participant_column="index_participant")
+        # integers are kept, booleans are accepted without conversion to text
+        assert(sample.df["likert1"].dtype == "int64")
+        assert(sample.df["answered"].tolist() == (df["age"] > 30).astype(float).tolist())
+        assert(sample.df["age"].iloc[0] == df["age"].iloc[0])
+        assert(sample.missing.columns_converted == ["answered", "age"])
+        assert(sample.missing.position == {"answered": [], "age": [3]})
+        assert(sample.missing.nb["age"] == (0, 1, 1))
+
+    def test_arguments_checked(self, df):
+        with pytest.raises(TypeError, match="missing a required argument"):
+            ot.Sample()
+        sample = ot.Sample(df, ["age", "random_col"], "index_participant")
+        assert(sample.method_SD(2).distance == sample.method_SD(distance="2").distance == 2.0)
+        with pytest.raises(ValueError, match="You need to enter a numeric"):
+            sample.method_SD(True)
+        with pytest.raises(TypeError, match="unexpected keyword argument"):
+            sample.method_SD(dist=2)
+        with pytest.raises(TypeError, match="multiple values"):
+            sample.method_SD(2, distance=3)
+        # the decorated methods keep their signature and documentation
+        assert("distance" in inspect.signature(ot.Sample.method_SD).parameters)
+        assert(ot.Sample.method_SD.__doc__.strip().startswith("## Standard Deviation"))
+
+    def test_sample_from_array(self, df, tmp_path):
+        values = df[["age", "random_col", "art_looking_time"]].to_numpy()
+        sample = ot.Sample(values, column_names=["age", "random_col", "art_looking_time"])
+        # no copy, the detection runs on the array
+        assert(np.shares_memory(sample.df.to_numpy(), values))
+        sample_df = ot.Sample(df[["age", "random_col", "art_looking_time"]])
+        assert(sample.method_SD().dict_col == sample_df.method_SD().dict_col)
+        assert(list(ot.Sample(values).df.columns) == ["Tested_0", "Tested_1", "Tested_2"])
+        assert(list(ot.Sample(values[:, 0]).df.columns) == ["Tested"])
+
+        np.save(tmp_path / "values.npy", values)
+        memmap = np.load(tmp_path / "values.npy", mmap_mode="r")
+        sample_memmap = ot.Sample(memmap)
+        assert(np.shares_memory(sample_memmap.df.to_numpy(), memmap))
+        assert(sample_memmap.method_MAD().nb == ot.Sample(values).method_MAD().nb)
+        assert(len(sample_memmap.method_MAD().manage("winsorise").index) == len(values))
+
+    def test_sample_keeps_user_dataframe(self, df):
+        df_user = df.copy()
+        df_user["age"] = df_user["age"].astype(str)
+        ot.Sample(df_user, columns_to_test=["age", "random_col"])
+        assert(df_user["age"].dtype != float)
+
+    def test_sample_from_parquet_and_arrow(self, df, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        from pyarrow import feather
+        columns = ["age", "art_looking_time", "likert1"]
+        df.to_parquet(tmp_path / "data.parquet")
+        feather.write_feather(df, tmp_path / "data.arrow", compression="uncompressed")
+        sample = ot.Sample(df, columns_to_test=columns, participant_column="index_participant")
+
+        sample_parquet = ot.Sample.from_parquet(tmp_path / "data.parquet", columns, "index_participant")
+        sample_arrow = ot.Sample.from_arrow(tmp_path / "data.arrow", columns, "index_participant")
+        assert(list(sample_parquet.df.columns) == columns)
+        pd.testing.assert_frame_equal(sample_parquet.df, sample.df[columns])
+        pd.testing.assert_frame_equal(sample_arrow.df, sample.df[columns])
+        assert(sample_parquet.missing.columns_converted == [])
+        assert(sample_arrow.method_IQR().dict_col == sample.method_IQR().dict_col)
+
+        # numeric columns of an Arrow table are not copied
+        table = pa.table({"x": np.arange(10.)})
+        sample_table = ot.Sample.from_arrow(table)
+        assert(sample_table.df["x"].to_numpy().ctypes.data ==
+               table.column("x").chunk(0).buffers()[1].address)
+
+    def test_sample_from_polars(self, df):
+        pl = pytest.importorskip("polars")
+        columns = ["age", "art_looking_time", "likert1"]
+        sample = ot.Sample(df, columns_to_test=columns, participant_column="index_participant")
+        for frame in (pl.from_pandas(df), pl.from_pandas(df).lazy()):
+            sample_polars = ot.Sample(frame, columns_to_test=columns, participant_column="index_participant")
+            pd.testing.assert_frame_equal(sample_polars.df, sample.df[columns])
+            for method in ("method_IQR", "method_SD", "method_MAD"):
+                assert(getattr(sample_polars, method)().dict_col ==
+                       getattr(sample, method)().dict_col)
+            # the read-only columns are copied when they are modified
+            sample_polars.df.loc["P1", "age"] = 1000
+            assert(sample_polars.method_SD().dict_col ==
+                   ot.Sample(sample_polars.df.copy()).method_SD().dict_col)
+
+    def test_sample_from_polars_text_column(self, df):
+        pl = pytest.importorskip("polars")
+        # columns converted by pandas (decimal comma, text) are not computed by Polars
+        frame = pl.DataFrame({"id": [f"P{i}" for i in range(100)],
+                              "a": [float(i) for i in range(99)] + [1000.0],
+                              "t": ["1,5"] * 98 + ["x", "30"]})
+        sample = ot.Sample(frame, columns_to_test=["a", "t"], participant_column="id")
+        assert(sample.missing.columns_converted == ["t"])
+        for method in ("method_IQR", "method_SD", "method_MAD", "method_tukey", "method_prctile"):
+            assert(getattr(sample, method)().dict_col ==
+                   getattr(ot.Sample(sample.df.copy()), method)().dict_col)
+        assert(sample.method_IQR().dict_col == {"a": ["P99"], "t": ["P99"]})
+
 os.chdir("..")
@@ -0,0 +1,31 @@
+# It is important to run "pip install -e ." before running test
+
+import pandas as pd
+import numpy as np
+import pytest
+import otpsy as ot
+
+df = pd.read_csv("./tests/data.csv", sep=";")
+class TestClass:
+    sample = ot.Sample(df,
+                       columns_to_test=["art_looking_time", "discrimination_performance"],
+                       participant_column="index_participant")
+    distances = [1, 1.5, 2, 2.4, 3]
+
+    def test_sweep(self):
+        sweep = self.sample.sweep(
+            self.distances, methods=["sd", "mad"], threshold_included=True,
+            return_index=True)
+        assert(len(sweep.index) == 2 * 2 * len(self.distances))
+        # same results as the method of each row
+        for row in sweep.itertuples():
+            if row.method == "sd":
+                outliers = self.sample.method_SD(
+                    distance=row.distance, threshold_included=True)
+            else:
+                outliers = self.sample.method_MAD(
+                    distance=row.distance, threshold_included=True)
+            assert(row.n_flagged == outliers.nb[row.column])
+            assert(row.flagged == outliers.dict_col[row.column])
+            assert((row.low_threshold, row.high_threshold) ==
+                   outliers.threshold[row.column])